@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for list_operations.py
+Reproducible timings for find_duplicates, remove_duplicates_preserve_order
+and find_common_elements across input sizes and value distributions.
+
+Usage:
+    python bench_list_operations.py                         # 1e3 .. 1e6
+    python bench_list_operations.py --sizes 1e3 1e7 1e8 --no-memory
+    python bench_list_operations.py --output bench_baseline.json
+    python bench_list_operations.py --baseline bench_baseline.json
+    python bench_list_operations.py --bloom 200000          # exact vs approximate
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from bisect import bisect_left
+from itertools import accumulate
+
+from list_operations import (BloomFilter, find_common_elements, find_duplicates,
+                             remove_duplicates_preserve_order)
+
+
+DEFAULT_SIZES = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]
+ZIPF_EXPONENT = 1.1
+
+
+def uniform_values(size, rng):
+    """Integers drawn uniformly from [0, size), about 63% distinct."""
+    return [rng.randrange(size) for _ in range(size)]
+
+
+def zipf_values(size, rng):
+    """Integers from [1, min(size, 1e6)] with P(i) proportional to 1 / i ** 1.1."""
+    support = min(size, 10 ** 6)
+    cum_weights = list(accumulate(1.0 / i ** ZIPF_EXPONENT for i in range(1, support + 1)))
+    total = cum_weights[-1]
+    return [bisect_left(cum_weights, rng.random() * total) + 1 for _ in range(size)]
+
+
+def all_unique_values(size, rng):
+    """Every value distinct, in random order."""
+    values = list(range(size))
+    rng.shuffle(values)
+    return values
+
+
+def all_equal_values(size, rng):
+    """The same value repeated size times."""
+    return [7] * size
+
+
+def sorted_values(size, rng):
+    """Uniform values in ascending order."""
+    return sorted(uniform_values(size, rng))
+
+
+DISTRIBUTIONS = {
+    'uniform': uniform_values,
+    'zipf': zipf_values,
+    'all_unique': all_unique_values,
+    'all_equal': all_equal_values,
+    'sorted': sorted_values,
+}
+
+FUNCTIONS = {
+    'find_duplicates': lambda first, second: find_duplicates(first),
+    'remove_duplicates_preserve_order': lambda first, second: remove_duplicates_preserve_order(first),
+    'find_common_elements': lambda first, second: find_common_elements(first, second),
+}
+
+
+def measure(func, *args, **kwargs):
+    """Return (result, seconds, peak traced bytes) for one call of func.
+
+    The timed run and the tracemalloc run are separate, because tracing
+    allocations slows the code down several times.
+    """
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func(*args, **kwargs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def best_time(func, args, repeat):
+    """Fastest wall time of repeat calls of func(*args)."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(func, args):
+    """Peak bytes allocated by Python during one call of func(*args)."""
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_suite(sizes, distributions, functions, seed=0, repeat=3, memory=True):
+    """Benchmark every (function, distribution, size) combination."""
+    results = []
+    for size in sizes:
+        for distribution in distributions:
+            rng = random.Random(f"{seed}-{distribution}-{size}")
+            first = DISTRIBUTIONS[distribution](size, rng)
+            second = DISTRIBUTIONS[distribution](size, rng)
+            for name in functions:
+                func = FUNCTIONS[name]
+                # a single run is enough once one call takes seconds
+                runs = repeat if size <= 10 ** 6 else 1
+                seconds = best_time(func, (first, second), runs)
+                record = {
+                    'function': name,
+                    'distribution': distribution,
+                    'size': size,
+                    'seconds': seconds,
+                    'elements_per_second': size / seconds if seconds else None,
+                    'peak_bytes': peak_memory(func, (first, second)) if memory else None,
+                }
+                results.append(record)
+                print_record(record)
+            del first, second
+    return results
+
+
+def print_record(record):
+    """Print one result line."""
+    peak = record['peak_bytes']
+    peak_text = f"{peak / 1e6:>10.2f}" if peak is not None else f"{'-':>10}"
+    print(f"{record['function']:<34}{record['distribution']:<12}{record['size']:>11,}"
+          f"{record['seconds']:>11.4f}{record['elements_per_second'] or 0:>15,.0f}{peak_text}")
+
+
+def compare_to_baseline(results, baseline, tolerance):
+    """Print time ratios against a baseline and return the regressions."""
+    previous = {(r['function'], r['distribution'], r['size']): r
+                for r in baseline['results']}
+    regressions = []
+    print(f"\n{'function':<34}{'distribution':<12}{'size':>11}{'ratio':>9}")
+    print("-" * 66)
+    for record in results:
+        key = (record['function'], record['distribution'], record['size'])
+        if key not in previous or not previous[key]['seconds']:
+            continue
+        ratio = record['seconds'] / previous[key]['seconds']
+        flag = "  SLOWER" if ratio > 1 + tolerance else ""
+        print(f"{key[0]:<34}{key[1]:<12}{key[2]:>11,}{ratio:>9.2f}{flag}")
+        if flag:
+            regressions.append((key, ratio))
+    return regressions
+
+
+def measured_false_positive_rate(expected_items, error_rate, probes=100000, seed=0):
+    """Fill a filter to capacity and count hits for values never added."""
+    rng = random.Random(seed)
+    bloom = BloomFilter(expected_items, error_rate)
+    added = rng.sample(range(10 ** 12), expected_items)
+    for value in added:
+        bloom.add(value)
+    added = set(added)
+    hits = tries = 0
+    while tries < probes:
+        value = rng.randrange(10 ** 12, 2 * 10 ** 12)
+        if value not in added:
+            tries += 1
+            hits += value in bloom
+    return hits / tries
+
+
+def bench_bloom(size=200000, error_rate=0.01, seed=0):
+    """Compare set, Bloom filter and bitmap dedup on mostly-unique integers."""
+    rng = random.Random(seed)
+    numbers = [rng.randrange(size * 4) for _ in range(size)]
+
+    print(f"{'function':<48}{'seconds':>10}{'items/s':>14}{'peak MB':>10}")
+    print("-" * 82)
+    cases = [
+        ("find_duplicates", find_duplicates, {}),
+        ("find_duplicates(approximate)", find_duplicates,
+         {'approximate': True, 'error_rate': error_rate}),
+        ("find_duplicates(use_bitmap)", find_duplicates, {'use_bitmap': True}),
+        ("remove_duplicates_preserve_order", remove_duplicates_preserve_order, {}),
+        ("remove_duplicates_preserve_order(approximate)", remove_duplicates_preserve_order,
+         {'approximate': True, 'error_rate': error_rate}),
+        ("remove_duplicates_preserve_order(use_bitmap)", remove_duplicates_preserve_order,
+         {'use_bitmap': True}),
+    ]
+    for name, func, kwargs in cases:
+        _, seconds, peak = measure(func, numbers, **kwargs)
+        print(f"{name:<48}{seconds:>10.3f}{size / seconds:>14,.0f}{peak / 1e6:>10.2f}")
+
+    bloom = BloomFilter(size, error_rate)
+    print(f"\nBloom filter for {size:,} items at {error_rate}: "
+          f"{bloom.memory_bytes() / 1e6:.2f} MB, {bloom.num_hashes} hashes")
+    rate = measured_false_positive_rate(min(size, 50000), error_rate, seed=seed)
+    print(f"Measured false-positive rate: {rate:.4f} (target {error_rate})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark list_operations.py")
+    parser.add_argument('--sizes', nargs='+', type=float, default=DEFAULT_SIZES,
+                        help="input sizes, e.g. 1e3 1e5 1e8")
+    parser.add_argument('--distributions', nargs='+', choices=DISTRIBUTIONS,
+                        default=list(DISTRIBUTIONS))
+    parser.add_argument('--functions', nargs='+', choices=FUNCTIONS, default=list(FUNCTIONS))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3, help="best-of runs per case")
+    parser.add_argument('--no-memory', action='store_true',
+                        help="skip the (slow) tracemalloc peak memory run")
+    parser.add_argument('--output', help="write results to this JSON file")
+    parser.add_argument('--baseline', help="compare against a previous --output file")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="allowed slowdown before a case counts as a regression")
+    parser.add_argument('--bloom', type=int, metavar='SIZE',
+                        help="only run the exact vs approximate comparison")
+    args = parser.parse_args(argv)
+
+    if args.bloom:
+        bench_bloom(args.bloom, seed=args.seed)
+        return 0
+
+    print(f"{'function':<34}{'distribution':<12}{'size':>11}{'seconds':>11}"
+          f"{'elements/s':>15}{'peak MB':>10}")
+    print("-" * 93)
+    results = run_suite([int(size) for size in args.sizes], args.distributions,
+                        args.functions, args.seed, args.repeat, not args.no_memory)
+
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump({
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'seed': args.seed,
+                'results': results,
+            }, handle, indent=2)
+        print(f"\nSaved {len(results)} results to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as handle:
+            regressions = compare_to_baseline(results, json.load(handle), args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) slower than baseline by more than "
+                  f"{args.tolerance:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for student_grades.py
+Read throughput of ConcurrentGradeBook as reader threads are added while
+writer threads keep streaming in grades, next to the same precomputed
+stats behind one lock.
+
+Usage:
+    python bench_student_grades.py                      # 1, 2, 4, 8 readers
+    python bench_student_grades.py --threads 1 16 32 --writers 2 --seconds 5
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+
+from student_grades import ConcurrentGradeBook, StudentAggregate
+
+
+DEFAULT_THREADS = [1, 2, 4, 8]
+
+
+def make_grades(students, grades_per_student, rng):
+    """Random integer grades for students named s0, s1, ..."""
+    return {'s%d' % i: [rng.randint(40, 100) for _ in range(grades_per_student)]
+            for i in range(students)}
+
+
+class LockedGrades:
+    """
+    The baseline: per-student aggregates behind a single lock.
+
+    Stats are precomputed at write time exactly like ConcurrentGradeBook
+    does, so the comparison isolates the cost of readers taking the lock.
+    """
+
+    def __init__(self, grades_dict):
+        self.grades = {name: list(grades) for name, grades in grades_dict.items()}
+        self.aggregates = {name: StudentAggregate(grades) for name, grades in grades_dict.items()}
+        self.stats = {name: aggregate.stats() for name, aggregate in self.aggregates.items()}
+        self.lock = threading.Lock()
+
+    def add_grade(self, name, grade):
+        with self.lock:
+            self.grades[name].append(grade)
+            aggregate = self.aggregates[name]
+            aggregate.add(grade)
+            self.stats[name] = aggregate.stats()
+
+    def student_stats(self, name):
+        with self.lock:
+            return dict(self.stats[name])
+
+
+def run_case(store, names, readers, writers, seconds, seed):
+    """Run readers and writers for seconds; return (reads/s, writes/s)."""
+    stop = threading.Event()
+    reads = [0] * readers
+    writes = [0] * writers
+
+    def reader(slot):
+        rng = random.Random(seed + slot)
+        count = 0
+        while not stop.is_set():
+            for _ in range(100):
+                store.student_stats(names[rng.randrange(len(names))])
+            count += 100
+        reads[slot] = count
+
+    def writer(slot):
+        rng = random.Random(-seed - slot - 1)
+        count = 0
+        while not stop.is_set():
+            store.add_grade(names[rng.randrange(len(names))], rng.randint(40, 100))
+            count += 1
+        writes[slot] = count
+
+    threads = ([threading.Thread(target=reader, args=(i,)) for i in range(readers)] +
+               [threading.Thread(target=writer, args=(i,)) for i in range(writers)])
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return sum(reads) / seconds, sum(writes) / seconds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark concurrent grade reads")
+    parser.add_argument('--threads', nargs='+', type=int, default=DEFAULT_THREADS,
+                        help="reader thread counts to try")
+    parser.add_argument('--writers', type=int, default=1, help="writer threads")
+    parser.add_argument('--students', type=int, default=10000)
+    parser.add_argument('--grades', type=int, default=10, help="grades per student")
+    parser.add_argument('--seconds', type=float, default=2.0, help="duration of each case")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    grades = make_grades(args.students, args.grades, random.Random(args.seed))
+    names = list(grades)
+    print(f"{'store':<22}{'readers':>8}{'writers':>8}{'reads/s':>14}{'writes/s':>12}")
+    print("-" * 64)
+    for readers in args.threads:
+        for label, store in (('ConcurrentGradeBook', ConcurrentGradeBook(grades)),
+                             ('dict + lock', LockedGrades(grades))):
+            read_rate, write_rate = run_case(store, names, readers, args.writers,
+                                             args.seconds, args.seed)
+            print(f"{label:<22}{readers:>8}{args.writers:>8}{read_rate:>14,.0f}"
+                  f"{write_rate:>12,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
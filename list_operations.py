@@ -3,12 +3,81 @@ Problem 1: List Operations
 Understanding of basic data structures - Lists and Sets
 """
 
-def find_duplicates(numbers):
+import hashlib
+import heapq
+import math
+import mmap
+import os
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from multiprocessing.shared_memory import SharedMemory
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; every function has a pure-Python path
+    np = None
+
+
+# Integer typecodes of array.array that NumPy can view without copying
+_INTEGER_TYPECODES = 'bBhHiIlLqQ'
+
+# Below this many elements the set-based loop beats the NumPy round trip
+NUMPY_MIN_SIZE = 10000
+
+# Rough cost of one int held in a set while deduplicating a spill bucket
+_SET_BYTES_PER_ITEM = 100
+
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+_GOLDEN64 = 0x9E3779B97F4A7C15
+
+# Intersect a sorted list by galloping search instead of a linear merge
+# once it is this many times longer than the current candidate list
+GALLOP_RATIO = 8
+
+# A bucket that is still too large after this many re-partitions is
+# deduplicated in memory anyway (it is dominated by a few repeated values)
+_MAX_SPILL_DEPTH = 4
+
+# At most this many sorted result files are open (and buffered) at once
+# while merging the per-bucket duplicates back together
+MERGE_FAN_IN = 64
+
+
+def find_duplicates(numbers, approximate=False, expected_items=None,
+                    error_rate=0.01, use_bitmap=False, workers=None):
     """
     Find all duplicate numbers in a list and return them as a sorted list.
     
+    Integer NumPy arrays, and integer array.array inputs of at least
+    NUMPY_MIN_SIZE elements, are handled in one vectorized pass when NumPy
+    is installed. Everything else uses the set-based loop.
+    
+    numbers may also be the path of a raw little-endian int64 file or an
+    mmap of one, read in place through int64_view, or a memoryview of
+    fixed-width integers. None of these is turned into a list of Python ints.
+    
+    With approximate=True the "seen" set is replaced by a fixed-size
+    BloomFilter, so memory does not grow with the number of distinct
+    values. Every real duplicate is still reported, but a unique value may
+    be reported as a duplicate with probability of about error_rate.
+    
     Args:
-        numbers (list): A list of integers
+        numbers (list): A list of integers (or an integer NumPy array /
+                        array.array / int64 file path / buffer)
+        approximate (bool): Use a Bloom filter instead of an exact set
+        expected_items (int): Distinct values the filter is sized for
+                              (default: len(numbers))
+        error_rate (float): Target false-positive rate of the filter
+        use_bitmap (bool): Track integers in RoaringBitmap sets instead of
+                           Python sets, trading some speed for memory
+        workers (int): Hash-partition the integers across this many
+                       processes (values must fit in 64 bits; an iterator
+                       is first read into an array('q'))
         
     Returns:
         list: A sorted list of duplicate numbers (no duplicates in result)
@@ -18,17 +87,451 @@ def find_duplicates(numbers):
         find_duplicates([1, 2, 3, 4, 5]) -> []
         find_duplicates([]) -> []
     """
-    # TODO: Implement this function
-    # Hint: Use a set to track seen numbers and another set for duplicates
-    pass
+    numbers = _maybe_int64_view(numbers)
+    if (approximate or use_bitmap) and np is not None and isinstance(numbers, np.ndarray):
+        # the per-item loops below should hash and return Python ints
+        numbers = numbers.tolist()
+    if approximate:
+        bloom = BloomFilter(_expected_items(numbers, expected_items), error_rate)
+        return sorted({number for number in numbers if bloom.add(number)})
+    if use_bitmap:
+        seen = RoaringBitmap()
+        duplicates = RoaringBitmap()
+        for number in numbers:
+            if not seen.add(number):
+                duplicates.add(number)
+        return list(duplicates)
+    if workers and workers > 1:
+        if not hasattr(numbers, '__len__'):
+            # iterators are read once into the int64 form the shards use anyway
+            numbers = array('q', numbers)
+        if len(numbers) > 1:
+            return _parallel_shards([numbers], workers, _duplicates_in_shard)
+    if _use_numpy(numbers):
+        return _find_duplicates_numpy(numbers)
+    return _find_duplicates_python(numbers)
+
+
+def _use_numpy(numbers):
+    """Decide whether the vectorized backend should handle numbers."""
+    if np is None:
+        return False
+    if isinstance(numbers, np.ndarray):
+        return numbers.dtype.kind in 'iu'
+    if isinstance(numbers, array):
+        return (numbers.typecode in _INTEGER_TYPECODES
+                and len(numbers) >= NUMPY_MIN_SIZE)
+    if isinstance(numbers, memoryview):
+        return numbers.format in _INTEGER_TYPECODES
+    return False
+
+
+def _as_ndarray(numbers):
+    """View an integer array.array, memoryview or ndarray as a 1-D ndarray."""
+    if isinstance(numbers, (array, memoryview)):
+        typecode = numbers.typecode if isinstance(numbers, array) else numbers.format
+        if not numbers:
+            return np.empty(0, dtype=typecode)
+        return np.frombuffer(numbers, dtype=typecode)
+    return np.ravel(numbers)
+
+
+def int64_view(source):
+    """
+    Expose raw little-endian int64 data as a sequence without copying it.
+    
+    A file path is memory-mapped read-only, so the operating system pages
+    values in on demand. An mmap, bytes-like object or memoryview is cast
+    in place. The result supports len(), indexing, slicing and iteration,
+    and Python ints are only created for the values actually read.
+    
+    Args:
+        source (str or buffer): Path of an int64 file, an mmap, or any
+                                object supporting the buffer protocol
+        
+    Returns:
+        memoryview: A read-only view with format 'q' (an array.array copy
+                    on big-endian hosts, where the bytes must be swapped)
+        
+    Example:
+        find_duplicates(int64_view('ids.bin'))
+        int64_view(array('q', [1, 2]).tobytes()).tolist() -> [1, 2]
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as handle:
+            if os.fstat(handle.fileno()).st_size == 0:
+                data = b''
+            else:
+                data = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    else:
+        data = source
+    view = memoryview(data)
+    if view.format != 'q':
+        view = view.cast('B').cast('q')
+    if sys.byteorder == 'big':
+        values = array('q', view)
+        values.byteswap()
+        return values
+    return view
+
+
+def _maybe_int64_view(numbers):
+    """Route file paths and mmaps through int64_view."""
+    if isinstance(numbers, (str, os.PathLike, mmap.mmap)):
+        return int64_view(numbers)
+    return numbers
+
+
+def _find_duplicates_python(numbers):
+    """Count-based duplicate search, works for any hashable, orderable values."""
+    return DuplicateTracker(numbers).duplicates()
+
+
+class DuplicateTracker:
+    """
+    Keep the duplicates of a changing collection up to date.
+    
+    A count per value is updated on every add/remove, and a sorted list of
+    the values seen more than once is maintained alongside it, so reading
+    the current duplicates costs O(d) instead of a rescan of the collection.
+    
+    Example:
+        tracker = DuplicateTracker([1, 2, 3, 2])
+        tracker.duplicates() -> [2]
+        tracker.add(3)
+        tracker.duplicates() -> [2, 3]
+        tracker.remove(2)
+        tracker.duplicates() -> [3]
+    """
+    
+    def __init__(self, numbers=()):
+        self._counts = {}
+        self._duplicates = []
+        self._size = 0
+        self.extend(numbers)
+    
+    def add(self, value):
+        """Add one occurrence of value."""
+        count = self._counts.get(value, 0) + 1
+        self._counts[value] = count
+        self._size += 1
+        if count == 2:
+            insort(self._duplicates, value)
+    
+    def extend(self, values):
+        """Add one occurrence of every value in an iterable."""
+        counts = self._counts
+        get = counts.get
+        new_duplicates = []
+        size = 0
+        for value in values:
+            count = get(value, 0) + 1
+            counts[value] = count
+            size += 1
+            if count == 2:
+                new_duplicates.append(value)
+        self._size += size
+        if new_duplicates:
+            new_duplicates.sort()
+            if self._duplicates:
+                self._duplicates = list(heapq.merge(self._duplicates, new_duplicates))
+            else:
+                self._duplicates = new_duplicates
+    
+    def remove(self, value):
+        """Remove one occurrence of value; ValueError if it is not present."""
+        count = self._counts.get(value)
+        if count is None:
+            raise ValueError("%r is not in the tracker" % (value,))
+        self._size -= 1
+        if count == 1:
+            del self._counts[value]
+            return
+        self._counts[value] = count - 1
+        if count == 2:
+            del self._duplicates[bisect_left(self._duplicates, value)]
+    
+    def count(self, value):
+        """Number of occurrences of value currently tracked."""
+        return self._counts.get(value, 0)
+    
+    def duplicates(self):
+        """Sorted list of values that currently occur more than once."""
+        return list(self._duplicates)
+    
+    def __len__(self):
+        return self._size
+
+
+def _find_duplicates_numpy(numbers):
+    """Sort-based duplicate search: equal neighbours after sorting repeat."""
+    values = np.sort(_as_ndarray(numbers))
+    if values.size < 2:
+        return []
+    repeated = values[1:][values[1:] == values[:-1]]
+    if repeated.size == 0:
+        return []
+    # repeated is sorted, so keep only the first entry of each run
+    first = np.empty(repeated.size, dtype=bool)
+    first[0] = True
+    np.not_equal(repeated[1:], repeated[:-1], out=first[1:])
+    return repeated[first].tolist()
+
+
+def find_duplicates_external(source, memory_limit=64 * 1024 * 1024,
+                             num_buckets=64, tmp_dir=None):
+    """
+    Find duplicates in an input that may be larger than memory.
+    
+    Values are hash-partitioned into temporary spill files, each bucket is
+    deduplicated on its own, and the per-bucket results are merged back
+    into one sorted list. Only one bucket is held in memory at a time, and
+    the results are merged MERGE_FAN_IN files at a time, so neither open
+    files nor read buffers grow with the number of buckets.
+    
+    Args:
+        source (iterable or str): Any iterable of integers, or the path of a
+                                  text file of whitespace-separated integers
+        memory_limit (int): Approximate memory budget in bytes for one bucket
+        num_buckets (int): Number of spill files per partitioning pass
+        tmp_dir (str): Directory for spill files (default: system temp dir)
+        
+    Returns:
+        list: A sorted list of duplicate numbers, same as find_duplicates
+        
+    Note:
+        Values must fit in a signed 64-bit integer.
+        
+    Example:
+        find_duplicates_external(iter([3, 1, 3, 2, 1])) -> [1, 3]
+        find_duplicates_external('ids.txt') -> [...]
+    """
+    return list(iter_duplicates_external(source, memory_limit, num_buckets, tmp_dir))
+
+
+def iter_duplicates_external(source, memory_limit=64 * 1024 * 1024,
+                             num_buckets=64, tmp_dir=None):
+    """
+    Generator version of find_duplicates_external.
+    
+    Yields the duplicates in ascending order without building the result
+    list, so memory stays bounded even when there are many duplicates.
+    """
+    if num_buckets < 2:
+        raise ValueError("num_buckets must be at least 2")
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as workdir:
+        results = []
+        _spill_and_dedup(_iter_integers(source), os.path.join(workdir, 'bucket'),
+                         memory_limit, num_buckets, 0, results)
+        # fan_in read buffers plus one write buffer share the memory budget
+        chunk_items = max(1024, memory_limit // (8 * (MERGE_FAN_IN + 1)))
+        results = _merge_runs(results, os.path.join(workdir, 'run'), chunk_items)
+        readers = [_read_spill(path, chunk_items) for path in results]
+        yield from heapq.merge(*readers)
 
 
-def remove_duplicates_preserve_order(numbers):
+def _merge_runs(paths, prefix, chunk_items):
+    """Merge sorted int64 files MERGE_FAN_IN at a time until at most that many remain."""
+    level = 0
+    while len(paths) > MERGE_FAN_IN:
+        merged = []
+        for start in range(0, len(paths), MERGE_FAN_IN):
+            group = paths[start:start + MERGE_FAN_IN]
+            if len(group) == 1:
+                merged.extend(group)
+                continue
+            path = '%s-%d-%d.run' % (prefix, level, len(merged))
+            buffer = array('q')
+            with open(path, 'wb') as handle:
+                for value in heapq.merge(*[_read_spill(run, chunk_items) for run in group]):
+                    buffer.append(value)
+                    if len(buffer) >= chunk_items:
+                        buffer.tofile(handle)
+                        del buffer[:]
+                buffer.tofile(handle)
+            for run in group:
+                os.remove(run)
+            merged.append(path)
+        paths = merged
+        level += 1
+    return paths
+
+
+def _iter_integers(source):
+    """Yield integers from an iterable or a whitespace-separated text file."""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source) as handle:
+            for line in handle:
+                for token in line.split():
+                    yield int(token)
+    else:
+        yield from source
+
+
+def _bucket_of(value, salt, num_buckets):
+    """Hash a value to a bucket; each depth passes its own salt, _mix64(depth + 1)."""
+    return _mix64((value & _MASK64) ^ salt) % num_buckets
+
+
+def _spill_and_dedup(values, prefix, memory_limit, num_buckets, depth, results):
+    """Partition values into spill files and dedup each one (recursively)."""
+    paths = ['%s-%d.bin' % (prefix, i) for i in range(num_buckets)]
+    buffers = [array('q') for _ in range(num_buckets)]
+    counts = [0] * num_buckets
+    flush_at = max(1024, memory_limit // (8 * num_buckets))
+    # an independent hash per depth, so a re-partitioned bucket really splits
+    salt = _mix64(depth + 1)
+
+    handles = [open(path, 'wb') for path in paths]
+    try:
+        for value in values:
+            index = _bucket_of(value, salt, num_buckets)
+            buffer = buffers[index]
+            buffer.append(value)
+            if len(buffer) >= flush_at:
+                buffer.tofile(handles[index])
+                counts[index] += len(buffer)
+                del buffer[:]
+        for index, buffer in enumerate(buffers):
+            buffer.tofile(handles[index])
+            counts[index] += len(buffer)
+    finally:
+        for handle in handles:
+            handle.close()
+    del buffers
+
+    for path, count in zip(paths, counts):
+        if count * _SET_BYTES_PER_ITEM > memory_limit and depth < _MAX_SPILL_DEPTH:
+            _spill_and_dedup(_read_spill(path), path[:-len('.bin')], memory_limit,
+                             num_buckets, depth + 1, results)
+        elif count > 1:
+            duplicates = _find_duplicates_python(_read_spill(path))
+            if duplicates:
+                result_path = path[:-len('.bin')] + '.dups'
+                with open(result_path, 'wb') as handle:
+                    array('q', duplicates).tofile(handle)
+                results.append(result_path)
+        os.remove(path)
+
+
+def _read_spill(path, chunk_items=65536):
+    """Stream the int64 values back out of a spill file."""
+    with open(path, 'rb') as handle:
+        while True:
+            chunk = array('q')
+            chunk.frombytes(handle.read(chunk_items * 8))
+            if not chunk:
+                return
+            yield from chunk
+
+
+def find_frequent(numbers, k, sketch=None):
+    """
+    Find the most repeated values in one pass with O(k) memory.
+    
+    Uses the Misra-Gries summary: at most k counters are kept, and when a
+    new value arrives with all counters taken, every counter is decreased
+    by one. For a stream of n values and a true count c, the reported
+    count e satisfies
+    
+        c - n / (k + 1) <= e <= c
+    
+    so every value occurring more than n / (k + 1) times is reported.
+    
+    Args:
+        numbers (iterable): Any iterable of hashable values
+        k (int): Number of counters to keep
+        sketch (CountMinSketch): Optional sketch updated in the same pass,
+                                 for point queries on any value afterwards
+        
+    Returns:
+        list: (value, estimated_count) tuples, highest count first and
+              ties broken by value
+        
+    Example:
+        find_frequent([1, 1, 1, 2, 2, 3], 2) -> [(1, 2), (2, 1)]
+    """
+    if k < 1:
+        raise ValueError("k must be at least 1")
+    counters = {}
+    for value in numbers:
+        if sketch is not None:
+            sketch.add(value)
+        if value in counters:
+            counters[value] += 1
+        elif len(counters) < k:
+            counters[value] = 1
+        else:
+            for key in list(counters):
+                if counters[key] == 1:
+                    del counters[key]
+                else:
+                    counters[key] -= 1
+    return sorted(counters.items(), key=lambda item: (-item[1], item[0]))
+
+
+class CountMinSketch:
+    """
+    Fixed-size frequency table answering "how often did x occur?".
+    
+    Estimates never undercount. With width = ceil(e / epsilon) and
+    depth = ceil(ln(1 / delta)), an estimate exceeds the true count by more
+    than epsilon * n (n = total additions) with probability at most delta.
+    
+    Example:
+        sketch = CountMinSketch.from_error(epsilon=0.001, delta=0.01)
+        find_frequent(events, 10, sketch=sketch)
+        sketch.estimate(42) -> count of 42, possibly slightly high
+    """
+    
+    def __init__(self, width, depth):
+        if width < 1 or depth < 1:
+            raise ValueError("width and depth must be at least 1")
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self._rows = [array('Q', bytes(8 * width)) for _ in range(depth)]
+    
+    @classmethod
+    def from_error(cls, epsilon, delta):
+        """Size a sketch for additive error epsilon * n with probability 1 - delta."""
+        return cls(int(math.ceil(math.e / epsilon)), int(math.ceil(math.log(1 / delta))))
+    
+    def _columns(self, value):
+        h = _hash64(value)
+        for row in range(self.depth):
+            mixed = ((h ^ (row * _GOLDEN64)) * 0xBF58476D1CE4E5B9) & _MASK64
+            yield (mixed ^ (mixed >> 31)) % self.width
+    
+    def add(self, value, count=1):
+        """Record count more occurrences of value."""
+        self.total += count
+        for row, column in zip(self._rows, self._columns(value)):
+            row[column] += count
+    
+    def estimate(self, value):
+        """Upper-bound estimate of how often value was added."""
+        return min(row[column] for row, column in zip(self._rows, self._columns(value)))
+
+
+def remove_duplicates_preserve_order(numbers, approximate=False,
+                                     expected_items=None, error_rate=0.01,
+                                     use_bitmap=False):
     """
     Remove duplicates from a list while preserving the original order.
     
+    With approximate=True a fixed-size BloomFilter tracks the values seen
+    so far. No duplicate is ever kept, but a first occurrence may be
+    dropped with probability of about error_rate.
+    
     Args:
         numbers (list): A list of integers
+        approximate (bool): Use a Bloom filter instead of an exact set
+        expected_items (int): Distinct values the filter is sized for
+                              (default: len(numbers))
+        error_rate (float): Target false-positive rate of the filter
+        use_bitmap (bool): Track integers in a RoaringBitmap instead of a
+                           Python set, trading some speed for memory
         
     Returns:
         list: List with duplicates removed, original order preserved
@@ -37,17 +540,166 @@ def remove_duplicates_preserve_order(numbers):
         remove_duplicates_preserve_order([1, 2, 3, 2, 4, 1, 5]) -> [1, 2, 3, 4, 5]
         remove_duplicates_preserve_order([]) -> []
     """
-    # TODO: Implement this function
-    pass
+    if approximate:
+        bloom = BloomFilter(_expected_items(numbers, expected_items), error_rate)
+        return [number for number in numbers if not bloom.add(number)]
+    if use_bitmap:
+        seen = RoaringBitmap()
+        return [number for number in numbers if seen.add(number)]
+    seen = set()
+    result = []
+    for number in numbers:
+        if number not in seen:
+            seen.add(number)
+            result.append(number)
+    return result
 
 
-def find_common_elements(list1, list2):
+def iter_unique(iterable, window=None):
     """
-    Find common elements between two lists.
+    Lazily yield the first occurrence of each value as it arrives.
+    
+    Without a window every value seen so far is remembered, just like
+    remove_duplicates_preserve_order. With window=N only the N most
+    recently seen distinct values are remembered (least recently seen is
+    forgotten first), so memory stays constant on endless streams; a value
+    that comes back after being forgotten is yielded again.
+    
+    Args:
+        iterable (iterable): Any iterable of hashable values
+        window (int): How many recent distinct values to remember
+        
+    Yields:
+        Values from iterable, skipping repeats
+        
+    Example:
+        list(iter_unique([1, 2, 1, 3])) -> [1, 2, 3]
+        list(iter_unique([1, 2, 3, 1], window=2)) -> [1, 2, 3, 1]
+    """
+    if window is None:
+        seen = set()
+        for value in iterable:
+            if value not in seen:
+                seen.add(value)
+                yield value
+        return
+    if window < 1:
+        raise ValueError("window must be at least 1")
+    recent = OrderedDict()
+    for value in iterable:
+        if value in recent:
+            recent.move_to_end(value)
+            continue
+        recent[value] = None
+        if len(recent) > window:
+            recent.popitem(last=False)
+        yield value
+
+
+def _expected_items(numbers, expected_items):
+    """Pick the Bloom filter capacity, defaulting to the input length."""
+    if expected_items is not None:
+        return expected_items
+    try:
+        return len(numbers)
+    except TypeError:
+        raise ValueError("expected_items is required when numbers has no len()")
+
+
+class BloomFilter:
+    """
+    Fixed-size probabilistic set backed by a bytearray.
+    
+    Membership tests never give false negatives. False positives happen
+    with probability close to error_rate once expected_items distinct
+    values have been added, and more often beyond that.
+    
+    Example:
+        bloom = BloomFilter(expected_items=1000, error_rate=0.01)
+        bloom.add(42) -> False   (42 was not seen before)
+        42 in bloom -> True
+    """
+    
+    def __init__(self, expected_items, error_rate=0.01):
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        expected_items = max(1, expected_items)
+        self.num_bits = max(8, int(math.ceil(
+            -expected_items * math.log(error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / expected_items * math.log(2))))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+    
+    def _positions(self, item):
+        """Bit positions for item, using double hashing."""
+        h = _hash64(item)
+        position = h % self.num_bits
+        step = 1 + (h >> 32) % (self.num_bits - 1)
+        for _ in range(self.num_hashes):
+            yield position
+            position = (position + step) % self.num_bits
+    
+    def add(self, item):
+        """Add item and return True if it was (probably) already present."""
+        bits = self.bits
+        present = True
+        for position in self._positions(item):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not bits[byte] & mask:
+                present = False
+                bits[byte] |= mask
+        return present
+    
+    def __contains__(self, item):
+        bits = self.bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+    
+    def estimated_false_positive_rate(self):
+        """False-positive rate implied by the fraction of bits set so far."""
+        bits_set = int.from_bytes(self.bits, 'little').bit_count()
+        return (bits_set / self.num_bits) ** self.num_hashes
+    
+    def memory_bytes(self):
+        """Size of the bit array in bytes."""
+        return len(self.bits)
+
+
+def find_common_elements(list1, list2, *more_lists, sorted_inputs=None,
+                         use_bitmap=False, workers=None):
+    """
+    Find common elements between two or more lists.
+    
+    Lists are intersected smallest first, so the candidate set only ever
+    shrinks. Each further list is handled by the cheapest strategy that
+    fits it:
+    - sorted and much longer than the candidates: galloping (exponential
+      plus binary) search, about O(small * log(large))
+    - sorted and of similar size: a linear merge
+    - unsorted: one hashing pass over the list
+    
+    Like find_duplicates, any list may instead be an int64 file path or
+    buffer, read in place through int64_view. With NumPy, such inputs (and
+    integer NumPy arrays) are intersected with np.intersect1d on views of
+    the raw data; without it, two sorted inputs of similar size are merge
+    joined, so only the common values become Python ints. Two sorted
+    inputs too large for memory can be streamed with iter_common_elements.
+    
+    Sortedness is detected with a linear scan unless sorted_inputs is
+    given. Pass sorted_inputs=True for already sorted lists to skip the scan
+    and get the O(small * log(large)) cost for very skewed sizes.
+    
+    With use_bitmap=True each integer list is loaded into a RoaringBitmap
+    and the bitmaps are intersected container by container instead. With
+    workers=N the integers are hash-partitioned across N processes and each
+    one intersects its own shard.
     
     Args:
         list1 (list): First list of integers
         list2 (list): Second list of integers
+        *more_lists (list): Any number of further lists to intersect
+        sorted_inputs (bool): True if all lists are sorted ascending,
+                              False to never check, None to detect
+        use_bitmap (bool): Intersect RoaringBitmap sets of the integers
+        workers (int): Number of processes to shard the work across
         
     Returns:
         list: Sorted list of common elements (no duplicates)
@@ -55,6 +707,639 @@ def find_common_elements(list1, list2):
     Example:
         find_common_elements([1, 2, 3, 4], [3, 4, 5, 6]) -> [3, 4]
         find_common_elements([1, 2], [3, 4]) -> []
+        find_common_elements([1, 2, 3], [2, 3], [3, 2, 9]) -> [2, 3]
     """
-    # TODO: Implement this function
-    pass
+    lists = [_maybe_int64_view(seq) for seq in (list1, list2) + more_lists]
+    lists = [seq if hasattr(seq, '__getitem__') else list(seq) for seq in lists]
+    lists.sort(key=len)
+    if len(lists[0]) == 0:
+        return []
+    if use_bitmap:
+        common = RoaringBitmap(lists[0])
+        for seq in lists[1:]:
+            if not common:
+                break
+            common = common & RoaringBitmap(seq)
+        return list(common)
+    if workers and workers > 1:
+        return _parallel_shards(lists, workers, _common_in_shard)
+    if any(_use_numpy(seq) for seq in lists):
+        common = _find_common_numpy(lists)
+        if common is not None:
+            return common
+
+    def is_sorted(seq):
+        if sorted_inputs is None:
+            return _is_sorted(seq)
+        return sorted_inputs
+
+    smallest, rest = lists[0], lists[1:]
+    if (is_sorted(smallest) and is_sorted(rest[0])
+            and len(rest[0]) <= GALLOP_RATIO * len(smallest)):
+        # a merge join only materializes the common values, not smallest
+        candidates = list(_merge_join(smallest, rest[0], False, True, False))
+        rest = rest[1:]
+    elif is_sorted(smallest):
+        candidates = _unique_sorted(smallest)
+    else:
+        candidates = sorted(set(smallest))
+
+    for seq in rest:
+        if not candidates:
+            break
+        if is_sorted(seq):
+            candidates = _intersect_sorted(candidates, seq)
+        else:
+            found = set(candidates).intersection(seq)
+            candidates = [value for value in candidates if value in found]
+    return candidates
+
+
+def _find_common_numpy(lists):
+    """np.intersect1d over in-place views; None if the lists do not share an integer dtype."""
+    arrays = [_as_ndarray(seq) if _use_numpy(seq) else np.asarray(seq) for seq in lists]
+    if len({values.dtype.kind for values in arrays}) != 1 or arrays[0].dtype.kind not in 'iu':
+        return None
+    common = np.unique(arrays[0])
+    for values in arrays[1:]:
+        if not common.size:
+            break
+        common = np.intersect1d(common, values, assume_unique=False)
+    return common.tolist()
+
+
+def _is_sorted(seq):
+    """Check that seq is in ascending order."""
+    return all(a <= b for a, b in zip(seq, islice(seq, 1, None)))
+
+
+def _unique_sorted(seq):
+    """Drop repeated neighbours from a sorted sequence."""
+    result = []
+    for value in seq:
+        if not result or result[-1] != value:
+            result.append(value)
+    return result
+
+
+def _intersect_sorted(small, large):
+    """Intersect a sorted, repeat-free list with a sorted list."""
+    result = []
+    n = len(large)
+    if n > GALLOP_RATIO * len(small):
+        lo = 0
+        for value in small:
+            bound = 1
+            while lo + bound < n and large[lo + bound] < value:
+                bound *= 2
+            lo = bisect_left(large, value, lo, min(lo + bound + 1, n))
+            if lo == n:
+                break
+            if large[lo] == value:
+                result.append(value)
+        return result
+
+    i = j = 0
+    m = len(small)
+    while i < m and j < n:
+        a, b = small[i], large[j]
+        if a < b:
+            i += 1
+        elif b < a:
+            j += 1
+        else:
+            result.append(a)
+            i += 1
+            j += 1
+    return result
+
+
+def iter_common_elements(sorted1, sorted2):
+    """
+    Stream the common elements of two sorted inputs with O(1) memory.
+    
+    Both inputs are read once, in lockstep, like a database merge join.
+    Repeated values are skipped, so each common value is yielded once, in
+    ascending order.
+    
+    Args:
+        sorted1 (iterable or str): Ascending iterable of integers, or the
+                                   path of a sorted text file of integers
+                                   (use int64_view(path) for int64 files)
+        sorted2 (iterable or str): Second input, same rules
+        
+    Yields:
+        int: Values present in both inputs, ascending
+        
+    Raises:
+        ValueError: If an input turns out not to be sorted
+        
+    Example:
+        list(iter_common_elements([1, 2, 2, 5], iter([2, 3, 5]))) -> [2, 5]
+    """
+    return _merge_join(sorted1, sorted2, False, True, False)
+
+
+def iter_union_elements(sorted1, sorted2):
+    """
+    Stream the distinct values found in either sorted input, ascending.
+    
+    Example:
+        list(iter_union_elements([1, 2, 2, 5], [2, 3])) -> [1, 2, 3, 5]
+    """
+    return _merge_join(sorted1, sorted2, True, True, True)
+
+
+def iter_difference_elements(sorted1, sorted2):
+    """
+    Stream the distinct values of sorted1 that are not in sorted2, ascending.
+    
+    Example:
+        list(iter_difference_elements([1, 2, 2, 5], [2, 3])) -> [1, 5]
+    """
+    return _merge_join(sorted1, sorted2, True, False, False)
+
+
+def _merge_join(left, right, keep_left, keep_both, keep_right):
+    """Walk two sorted inputs together, yielding values from the chosen sides."""
+    left = _iter_sorted_unique(_iter_integers(left))
+    right = _iter_sorted_unique(_iter_integers(right))
+    done = object()
+    a = next(left, done)
+    b = next(right, done)
+    while a is not done and b is not done:
+        if a < b:
+            if keep_left:
+                yield a
+            a = next(left, done)
+        elif b < a:
+            if keep_right:
+                yield b
+            b = next(right, done)
+        else:
+            if keep_both:
+                yield a
+            a = next(left, done)
+            b = next(right, done)
+    if keep_left:
+        while a is not done:
+            yield a
+            a = next(left, done)
+    if keep_right:
+        while b is not done:
+            yield b
+            b = next(right, done)
+
+
+def _iter_sorted_unique(values):
+    """Skip repeated runs of a sorted iterable, checking that it is sorted."""
+    previous = done = object()
+    for value in values:
+        if previous is not done:
+            if value == previous:
+                continue
+            if value < previous:
+                raise ValueError("input is not sorted: %r after %r" % (value, previous))
+        yield value
+        previous = value
+
+
+# Hashes per MinHash signature and values hashed per vectorized chunk
+MINHASH_PERMUTATIONS = 128
+_MINHASH_CHUNK = 4096
+
+
+def _mix64(z):
+    """splitmix64 finalizer: scramble a 64-bit integer."""
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return z ^ (z >> 31)
+
+
+def _hash64(value):
+    """
+    64-bit hash of a hashable value for the probabilistic structures.
+    
+    Integers (and floats equal to one) are mixed by value, so distinct
+    64-bit integers never collide; hash() alone maps -1 and -2, or x and
+    x + 2**61 - 1, to the same number. Other values are mixed from hash().
+    """
+    if type(value) is float and value.is_integer():
+        value = int(value)
+    if isinstance(value, int):
+        return _mix64(value & _MASK64)
+    return _mix64(hash(value) & _MASK64)
+
+
+def _stable_hash64(value):
+    """
+    64-bit MinHash key that is the same in every process where possible.
+    
+    Integers map to themselves modulo 2**64 (minhash_signature mixes each
+    key with its per-slot salt), str and bytes to a BLAKE2 digest, and
+    anything else to hash().
+    """
+    if type(value) is float and value.is_integer():
+        value = int(value)
+    if isinstance(value, int):
+        return value & _MASK64
+    if isinstance(value, str):
+        value = value.encode('utf-8', 'surrogatepass')
+    if isinstance(value, (bytes, bytearray)):
+        return int.from_bytes(hashlib.blake2b(value, digest_size=8).digest(), 'little')
+    return hash(value) & _MASK64
+
+
+def minhash_signature(values, num_perm=MINHASH_PERMUTATIONS, seed=0):
+    """
+    Build a MinHash signature of the distinct values in one streaming pass.
+    
+    Each of the num_perm slots keeps the minimum of a different 64-bit hash
+    over all values. Two signatures agree in a slot with probability equal
+    to the Jaccard similarity of the two value sets, so comparing
+    signatures estimates overlap without touching the lists again. With
+    NumPy the hashes are computed a chunk of values at a time.
+    
+    Args:
+        values (iterable): Any iterable of hashable values
+        num_perm (int): Number of hash functions (accuracy ~ 1/sqrt(num_perm))
+        seed (int): Signatures are only comparable when built with the same
+                    num_perm and seed
+        
+    Returns:
+        array: array('Q') of num_perm minimum hashes
+        
+    Example:
+        a = minhash_signature(range(0, 1000))
+        b = minhash_signature(range(500, 1500))
+        estimate_jaccard(a, b) -> about 0.33
+        
+    Note:
+        Values are hashed deterministically: integers (modulo 2**64) and
+        floats by value, str and bytes by a BLAKE2 digest, so signatures of
+        such values can be stored and compared across runs. Other values
+        (tuples, custom objects) go through hash(), which Python randomizes
+        per process for anything containing strings, so their signatures
+        are only comparable within one process. Distinct values whose
+        64-bit hashes collide count as the same value.
+    """
+    salts = [_mix64((seed << 32) + i + 1) for i in range(num_perm)]
+    iterator = iter(values)
+    if np is not None:
+        salt_column = np.array(salts, dtype=np.uint64)[:, None]
+        minimums = np.full(num_perm, _MASK64, dtype=np.uint64)
+        while True:
+            chunk = list(islice(iterator, _MINHASH_CHUNK))
+            if not chunk:
+                break
+            keys = np.fromiter((_stable_hash64(value) for value in chunk),
+                               dtype=np.uint64, count=len(chunk))
+            np.minimum(minimums, _mix64_numpy(keys[None, :] ^ salt_column).min(axis=1),
+                       out=minimums)
+        signature = array('Q')
+        signature.frombytes(minimums.tobytes())
+        return signature
+
+    signature = array('Q', [_MASK64] * num_perm)
+    for value in iterator:
+        key = _stable_hash64(value)
+        for i, salt in enumerate(salts):
+            h = _mix64(key ^ salt)
+            if h < signature[i]:
+                signature[i] = h
+    return signature
+
+
+def _mix64_numpy(z):
+    """Vectorized _mix64; uint64 arithmetic wraps like the & _MASK64 version."""
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def estimate_jaccard(signature1, signature2):
+    """
+    Estimate |A & B| / |A | B| from two MinHash signatures.
+    
+    Example:
+        estimate_jaccard(minhash_signature([1, 2]), minhash_signature([1, 2])) -> 1.0
+    """
+    if len(signature1) != len(signature2):
+        raise ValueError("signatures must have the same length")
+    if np is not None:
+        return float(np.mean(np.frombuffer(signature1, dtype=np.uint64)
+                             == np.frombuffer(signature2, dtype=np.uint64)))
+    return sum(a == b for a, b in zip(signature1, signature2)) / len(signature1)
+
+
+def estimate_cardinality(signature):
+    """
+    Estimate the number of distinct values behind a MinHash signature.
+    
+    Each slot minimum of n uniform hashes is about 2**64 / (n + 1), so
+    (num_perm - 1) / sum(minimum / 2**64) estimates n.
+    """
+    if all(minimum == _MASK64 for minimum in signature):
+        return 0.0
+    return (len(signature) - 1) / sum(minimum / 2.0 ** 64 for minimum in signature)
+
+
+def estimate_overlap(signature1, signature2):
+    """
+    Estimate how many distinct values two sets share, |A & B|.
+    
+    The union size is estimated from the slot-wise minimum of the two
+    signatures, then scaled by the estimated Jaccard similarity.
+    
+    Example:
+        estimate_overlap(minhash_signature(range(1000)),
+                         minhash_signature(range(500, 1500))) -> about 500
+    """
+    union = array('Q', map(min, signature1, signature2))
+    return estimate_jaccard(signature1, signature2) * estimate_cardinality(union)
+
+
+def similar_pairs(signatures, threshold):
+    """
+    Screen many signatures for pairs worth intersecting exactly.
+    
+    Compares every signature against all later ones, one vectorized row at
+    a time when NumPy is installed.
+    
+    Args:
+        signatures (list): MinHash signatures built with the same settings
+        threshold (float): Minimum estimated Jaccard similarity to report
+        
+    Returns:
+        list: (i, j, jaccard) tuples with i < j, in index order
+        
+    Example:
+        sigs = [minhash_signature(lst) for lst in posting_lists]
+        for i, j, _ in similar_pairs(sigs, 0.5):
+            find_common_elements(posting_lists[i], posting_lists[j])
+    """
+    pairs = []
+    if np is not None and signatures:
+        matrix = np.array([np.frombuffer(sig, dtype=np.uint64) for sig in signatures])
+        for i in range(len(signatures) - 1):
+            scores = (matrix[i + 1:] == matrix[i]).mean(axis=1)
+            for offset in np.nonzero(scores >= threshold)[0].tolist():
+                pairs.append((i, i + 1 + offset, float(scores[offset])))
+        return pairs
+    for i in range(len(signatures)):
+        for j in range(i + 1, len(signatures)):
+            score = estimate_jaccard(signatures[i], signatures[j])
+            if score >= threshold:
+                pairs.append((i, j, score))
+    return pairs
+
+
+# Containers hold the low 16 bits of values sharing the same high bits.
+# Up to this many values they are sorted array('H'), above it bitmaps.
+_ARRAY_CONTAINER_MAX = 4096
+_BITMAP_CONTAINER_BYTES = 1 << 13
+
+# Set bit offsets of every possible byte, for walking bitmap containers
+_BYTE_BITS = tuple(tuple(bit for bit in range(8) if byte >> bit & 1)
+                   for byte in range(256))
+
+
+class RoaringBitmap:
+    """
+    Compressed set of integers in the style of a roaring bitmap.
+    
+    Values are split into chunks of 65536 by their high bits. A sparse
+    chunk is stored as a sorted array('H') of 2 bytes per value, and a dense
+    chunk as an 8 KB bitmap, so dense ID ranges cost about one bit per
+    value instead of the 60+ bytes of a Python set entry.
+    
+    Example:
+        bitmap = RoaringBitmap([5, 1, 70000])
+        bitmap.add(5) -> False   (already present)
+        list(bitmap) -> [1, 5, 70000]
+        list(bitmap & RoaringBitmap([5, 6])) -> [5]
+    """
+    
+    def __init__(self, values=()):
+        self._containers = {}
+        self._size = 0
+        for value in values:
+            self.add(value)
+    
+    def add(self, value):
+        """Add an integer and return True if it was not already present."""
+        key, low = value >> 16, value & 0xFFFF
+        container = self._containers.get(key)
+        if container is None:
+            self._containers[key] = array('H', (low,))
+            self._size += 1
+            return True
+        if type(container) is array:
+            index = bisect_left(container, low)
+            if index < len(container) and container[index] == low:
+                return False
+            if len(container) < _ARRAY_CONTAINER_MAX:
+                container.insert(index, low)
+                self._size += 1
+                return True
+            container = self._containers[key] = _array_to_bitmap(container)
+        byte, mask = low >> 3, 1 << (low & 7)
+        if container[byte] & mask:
+            return False
+        container[byte] |= mask
+        self._size += 1
+        return True
+    
+    def update(self, values):
+        """Add every value from an iterable."""
+        for value in values:
+            self.add(value)
+    
+    def __contains__(self, value):
+        container = self._containers.get(value >> 16)
+        if container is None:
+            return False
+        low = value & 0xFFFF
+        if type(container) is array:
+            index = bisect_left(container, low)
+            return index < len(container) and container[index] == low
+        return bool(container[low >> 3] & (1 << (low & 7)))
+    
+    def __len__(self):
+        return self._size
+    
+    def __iter__(self):
+        for key in sorted(self._containers):
+            container = self._containers[key]
+            base = key << 16
+            if type(container) is array:
+                for low in container:
+                    yield base | low
+            else:
+                for index, byte in enumerate(container):
+                    if byte:
+                        offset = base | (index << 3)
+                        for bit in _BYTE_BITS[byte]:
+                            yield offset | bit
+    
+    def __and__(self, other):
+        result = RoaringBitmap()
+        mine, theirs = self._containers, other._containers
+        if len(theirs) < len(mine):
+            mine, theirs = theirs, mine
+        for key, container in mine.items():
+            if key in theirs:
+                common, size = _intersect_containers(container, theirs[key])
+                if size:
+                    result._containers[key] = common
+                    result._size += size
+        return result
+    
+    def intersection(self, *others):
+        """Return the values present in this bitmap and all others."""
+        result = self
+        for other in others:
+            if not result:
+                break
+            result = result & other
+        return result
+    
+    def memory_bytes(self):
+        """Bytes used by the container payloads."""
+        return sum(len(container) * (2 if type(container) is array else 1)
+                   for container in self._containers.values())
+
+
+def _array_to_bitmap(container):
+    """Turn a sorted array('H') container into a bitmap container."""
+    bitmap = bytearray(_BITMAP_CONTAINER_BYTES)
+    for low in container:
+        bitmap[low >> 3] |= 1 << (low & 7)
+    return bitmap
+
+
+def _intersect_containers(a, b):
+    """Intersect two containers, returning (container, cardinality)."""
+    a_is_array, b_is_array = type(a) is array, type(b) is array
+    if a_is_array and b_is_array:
+        small, large = (a, b) if len(a) <= len(b) else (b, a)
+        common = array('H', _intersect_sorted(small, large))
+        return common, len(common)
+    if a_is_array or b_is_array:
+        values, bitmap = (a, b) if a_is_array else (b, a)
+        common = array('H', (low for low in values
+                             if bitmap[low >> 3] & (1 << (low & 7))))
+        return common, len(common)
+    bits = int.from_bytes(a, 'little') & int.from_bytes(b, 'little')
+    size = bits.bit_count()
+    bitmap = bytearray(bits.to_bytes(_BITMAP_CONTAINER_BYTES, 'little'))
+    if size > _ARRAY_CONTAINER_MAX:
+        return bitmap, size
+    common = array('H')
+    for index, byte in enumerate(bitmap):
+        if byte:
+            common.extend((index << 3) | bit for bit in _BYTE_BITS[byte])
+    return common, size
+
+
+def _parallel_shards(lists, workers, shard_task):
+    """
+    Hash-partition integer lists across a process pool.
+    
+    The lists are copied once into a shared memory block of int64 values.
+    In a first pass each worker takes a contiguous chunk and regroups it by
+    shard into a second shared block; in a second pass worker j reads back
+    shard j of every list and runs shard_task on it. Equal values always
+    land in the same shard, so the sorted per-shard results are disjoint
+    and are merged into one sorted list. Only names, offsets and results
+    cross process boundaries, never the input lists themselves.
+    """
+    total = sum(len(seq) for seq in lists)
+    size = max(8, total * 8)
+    source = SharedMemory(create=True, size=size)
+    target = SharedMemory(create=True, size=size)
+    try:
+        chunks = []
+        view = source.buf.cast('q')
+        try:
+            start = 0
+            for index, seq in enumerate(lists):
+                stop = start + len(seq)
+                view[start:stop] = array('q', seq)
+                step = max(1, -(-len(seq) // workers))
+                for chunk_start in range(start, stop, step):
+                    chunks.append((index, chunk_start, min(chunk_start + step, stop)))
+                start = stop
+        finally:
+            view.release()
+
+        with ProcessPoolExecutor(workers) as pool:
+            counts = list(pool.map(_partition_chunk, [
+                (source.name, target.name, start, stop, workers)
+                for _, start, stop in chunks]))
+            tasks = []
+            for shard in range(workers):
+                slices = [[] for _ in lists]
+                for (index, start, _), chunk_counts in zip(chunks, counts):
+                    offset = start + sum(chunk_counts[:shard])
+                    slices[index].append((offset, offset + chunk_counts[shard]))
+                tasks.append((target.name, slices))
+            results = list(pool.map(shard_task, tasks))
+        return list(heapq.merge(*results))
+    finally:
+        for block in (source, target):
+            block.close()
+            block.unlink()
+
+
+def _partition_chunk(task):
+    """Worker: regroup source[start:stop] by shard into target[start:stop]."""
+    source_name, target_name, start, stop, num_shards = task
+    source = SharedMemory(name=source_name)
+    target = SharedMemory(name=target_name)
+    values = source.buf.cast('q')
+    output = target.buf.cast('q')
+    try:
+        shards = [array('q') for _ in range(num_shards)]
+        for value in values[start:stop]:
+            shards[(((value * _GOLDEN64) & _MASK64) >> 32) % num_shards].append(value)
+        position = start
+        for shard in shards:
+            output[position:position + len(shard)] = shard
+            position += len(shard)
+        return [len(shard) for shard in shards]
+    finally:
+        values.release()
+        output.release()
+        source.close()
+        target.close()
+
+
+def _read_shard(target_name, slices):
+    """Worker: collect the values of one shard for each input list."""
+    block = SharedMemory(name=target_name)
+    values = block.buf.cast('q')
+    try:
+        return [[value for start, stop in list_slices for value in values[start:stop]]
+                for list_slices in slices]
+    finally:
+        values.release()
+        block.close()
+
+
+def _duplicates_in_shard(task):
+    """Worker: sorted duplicates of one shard."""
+    (numbers,) = _read_shard(*task)
+    return _find_duplicates_python(numbers)
+
+
+def _common_in_shard(task):
+    """Worker: sorted common elements of one shard across all lists."""
+    shards = _read_shard(*task)
+    shards.sort(key=len)
+    common = set(shards[0])
+    for shard in shards[1:]:
+        if not common:
+            break
+        common.intersection_update(shard)
+    return sorted(common)
@@ -3,13 +3,44 @@ Problem 2: Dictionary Management
 Understanding of basic data structures - Dictionaries
 """
 
-def calculate_student_stats(grades_dict):
+import csv
+import heapq
+import json
+import math
+import mmap
+import os
+import sqlite3
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; every function has a pure-Python path
+    np = None
+
+def calculate_student_stats(grades_dict, workers=None):
     """
     Calculate statistics from a dictionary of student grades.
     
+    grades_dict may also be any grade container with a stats() method
+    (GradeBook, RunningGradeStats, GradeSnapshot, GradeStore, StatsCache,
+    ConcurrentGradeBook), which answers in its own way, or a dictionary
+    of StudentAggregate values, answered from their running totals.
+    
+    With workers=N a plain dictionary is split into batches of students
+    that N processes turn into partial StudentAggregates, which are then
+    merged. The result is identical to the serial one.
+    
     Args:
         grades_dict (dict): Dictionary where keys are student names (str) 
-                           and values are lists of grades (list of int/float)
+                           and values are lists of grades (list of int/float),
+                           or a container with a stats() method
+        workers (int): Number of processes for a plain dictionary
                            
     Returns:
         dict: Dictionary with student names as keys and their stats as values.
@@ -32,9 +63,545 @@ def calculate_student_stats(grades_dict):
             'Bob': {'average': 85.33, 'highest': 92, 'lowest': 76, 'total_assignments': 3},
             'Charlie': {'average': 91.0, 'highest': 95, 'lowest': 87, 'total_assignments': 5}
         }
+        
+    Note:
+        A student with no grades gets an average of 0.0 and None for
+        highest and lowest.
+    """
+    stats = getattr(grades_dict, 'stats', None)
+    if stats is not None:
+        return stats()
+    if workers and workers > 1 and len(grades_dict) > 1:
+        items = list(grades_dict.items())
+        # several batches per worker keeps the pool busy when sizes vary
+        step = max(1, -(-len(items) // (workers * 4)))
+        batches = [items[i:i + step] for i in range(0, len(items), step)]
+        with ProcessPoolExecutor(workers) as pool:
+            aggregates = _merge_aggregates(pool.map(_aggregate_students, batches), {})
+        return {name: aggregate.stats() for name, aggregate in aggregates.items()}
+    return {name: _grade_stats(grades) for name, grades in grades_dict.items()}
+
+
+def _grade_stats(grades):
+    """Stats dictionary for one student's list of grades (or aggregate)."""
+    if isinstance(grades, StudentAggregate):
+        return grades.stats()
+    if not grades:
+        return _make_stats(0, 0, None, None)
+    return _make_stats(len(grades), _exact_sum(grades), max(grades), min(grades))
+
+
+def _exact_sum(grades):
+    """Sum ints exactly and floats with one correct rounding (math.fsum)."""
+    if all(type(grade) is int for grade in grades):
+        return sum(grades)
+    return math.fsum(grades)
+
+
+def _make_stats(count, total, highest, lowest):
+    """Build the stats dictionary returned by calculate_student_stats."""
+    return {
+        'average': round(total / count, 2) if count else 0.0,
+        'highest': highest,
+        'lowest': lowest,
+        'total_assignments': count,
+    }
+
+
+def _averages(grades_dict):
+    """Map each student to their rounded average grade."""
+    return {name: stats['average']
+            for name, stats in calculate_student_stats(grades_dict).items()}
+
+
+class GradeBook:
+    """
+    Columnar storage for many students' grades.
+    
+    Instead of one Python list per student, all grades live in one flat
+    float64 column. Student i's grades are grades[offsets[i]:offsets[i + 1]],
+    and names[i] is their (interned) name. With NumPy, per-student stats
+    are computed with np.add/maximum/minimum.reduceat over the whole column.
+    
+    Example:
+        book = GradeBook.from_dict({'Alice': [85, 92], 'Bob': [76]})
+        book.names -> ['Alice', 'Bob']
+        book.offsets -> array('q', [0, 2, 3])
+        calculate_student_stats(book)['Alice']['average'] -> 88.5
+    """
+    
+    DYADIC_SCALE = 1024
+    
+    def __init__(self, names, offsets, grades, integral=False):
+        if len(offsets) != len(names) + 1:
+            raise ValueError("offsets must have one more entry than names")
+        self.names = [sys.intern(name) for name in names]
+        self.offsets = array('q', offsets)
+        self.grades = array('d', grades)
+        # True when every grade was an int, so highest/lowest come back as ints
+        self.integral = integral
+    
+    @classmethod
+    def from_dict(cls, grades_dict):
+        """Build a GradeBook from a {name: [grades]} dictionary."""
+        offsets = array('q', [0])
+        grades = array('d')
+        integral = True
+        for student_grades in grades_dict.values():
+            grades.extend(student_grades)
+            offsets.append(len(grades))
+            if integral:
+                integral = all(type(grade) is int for grade in student_grades)
+        return cls(list(grades_dict), offsets, grades, integral)
+    
+    def __len__(self):
+        return len(self.names)
+    
+    def grades_of(self, index):
+        """Grades of the student at position index."""
+        return self.grades[self.offsets[index]:self.offsets[index + 1]]
+    
+    def to_dict(self):
+        """Convert back to a {name: [grades]} dictionary."""
+        convert = int if self.integral else float
+        return {name: [convert(grade) for grade in self.grades_of(i)]
+                for i, name in enumerate(self.names)}
+    
+    def stats(self):
+        """Per-student stats, same format as calculate_student_stats."""
+        counts, totals, highest, lowest = self._reduce()
+        convert = int if self.integral else float
+        result = {}
+        for i, name in enumerate(self.names):
+            if counts[i]:
+                result[name] = _make_stats(counts[i], totals[i],
+                                           convert(highest[i]), convert(lowest[i]))
+            else:
+                result[name] = _make_stats(0, 0, None, None)
+        return result
+    
+    def _reduce(self):
+        """
+        Per-student (counts, sums, maxima, minima) as Python lists.
+        
+        Sums round like _exact_sum: whole-number grades add up exactly in
+        float64, and float grades are summed with math.fsum per student.
+        With NumPy, fsum only reruns for students whose vectorized sum could
+        have rounded: those with a grade that is not a multiple of
+        1/DYADIC_SCALE, or grades too large to add up exactly.
+        """
+        if np is None:
+            counts, totals, highest, lowest = [], [], [], []
+            for i in range(len(self.names)):
+                segment = self.grades_of(i)
+                counts.append(len(segment))
+                totals.append(sum(segment) if self.integral else math.fsum(segment))
+                highest.append(max(segment) if segment else None)
+                lowest.append(min(segment) if segment else None)
+            return counts, totals, highest, lowest
+
+        offsets = np.frombuffer(self.offsets, dtype=np.int64)
+        counts = np.diff(offsets)
+        totals = np.zeros(len(counts))
+        highest = np.zeros(len(counts))
+        lowest = np.zeros(len(counts))
+        # reduceat needs non-empty segments; skipping the empty ones leaves
+        # each remaining segment ending exactly where the next one starts
+        present = counts > 0
+        if present.any():
+            grades = np.frombuffer(self.grades, dtype=np.float64)
+            starts = offsets[:-1][present]
+            totals[present] = np.add.reduceat(grades, starts)
+            highest[present] = np.maximum.reduceat(grades, starts)
+            lowest[present] = np.minimum.reduceat(grades, starts)
+            if not self.integral:
+                # multiples of 1/DYADIC_SCALE add up exactly while the scaled
+                # magnitudes stay below 2**53, so only the rest need fsum
+                scaled = grades * self.DYADIC_SCALE
+                inexact = np.add.reduceat((scaled != np.floor(scaled)).view(np.int8), starts)
+                magnitude = np.add.reduceat(np.abs(scaled), starts)
+                redo = np.zeros(len(counts), dtype=bool)
+                redo[present] = (inexact > 0) | (magnitude >= 2.0 ** 53)
+                for i in np.flatnonzero(redo).tolist():
+                    totals[i] = math.fsum(self.grades_of(i))
+        return counts.tolist(), totals.tolist(), highest.tolist(), lowest.tolist()
+
+
+def _add_partial(partials, x):
+    """Shewchuk's exact float accumulation, the algorithm behind math.fsum."""
+    i = 0
+    for y in partials:
+        if abs(x) < abs(y):
+            x, y = y, x
+        high = x + y
+        low = y - (high - x)
+        if low:
+            partials[i] = low
+            i += 1
+        x = high
+    partials[i:] = [x]
+
+
+def _partials_total(int_total, partials):
+    """Correctly rounded int_total + sum(partials), an int when there are no partials."""
+    if not partials:
+        return int_total
+    return math.fsum(partials + [int_total])
+
+
+class StudentAggregate:
+    """
+    Running statistics for one student, updated in O(1) per grade.
+    
+    Keeps the count, sum, lowest and highest grade, plus the running mean
+    and sum of squared deviations (Welford's method) for the variance.
+    Float grades are summed exactly (as math.fsum does), so the total does
+    not depend on the order grades arrive in or on how partial aggregates
+    are merged; stats always equal calculate_student_stats on the list.
+    
+    Given a compression, a TDigest of the grades is kept as well for
+    medians and percentiles (see TDigest for the accuracy trade-off).
+    
+    Example:
+        aggregate = StudentAggregate([85, 92])
+        aggregate.add(78)
+        aggregate.stats() -> {'average': 85.0, 'highest': 92, 'lowest': 78,
+                              'total_assignments': 3}
+        aggregate.variance -> 32.67 (approximately)
+        StudentAggregate([85, 92, 78], compression=100).quantile(0.5) -> 85.0
+    """
+    
+    __slots__ = ('count', 'lowest', 'highest', 'mean', '_m2', '_int_total', '_partials',
+                 'digest')
+    
+    def __init__(self, grades=(), compression=None):
+        self.count = 0
+        self.lowest = None
+        self.highest = None
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._int_total = 0
+        # non-overlapping float partials whose exact sum is the float total
+        self._partials = []
+        self.digest = TDigest(compression) if compression else None
+        for grade in grades:
+            self.add(grade)
+    
+    def add(self, grade):
+        """Fold one more grade into the aggregate."""
+        self.count += 1
+        if type(grade) is int:
+            self._int_total += grade
+        else:
+            self._add_partial(float(grade))
+        if self.count == 1:
+            self.lowest = self.highest = grade
+        elif grade < self.lowest:
+            self.lowest = grade
+        elif grade > self.highest:
+            self.highest = grade
+        delta = grade - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (grade - self.mean)
+        if self.digest is not None:
+            self.digest.add(grade)
+    
+    def merge(self, other):
+        """Fold another aggregate (e.g. from a different partition) into this one."""
+        if not other.count:
+            return self
+        compression = self.digest.compression if self.digest is not None else None
+        other_compression = other.digest.compression if other.digest is not None else None
+        if compression != other_compression:
+            raise ValueError("cannot merge aggregates built with compression %r and %r"
+                             % (compression, other_compression))
+        if not self.count:
+            self.lowest, self.highest = other.lowest, other.highest
+        else:
+            self.lowest = min(self.lowest, other.lowest)
+            self.highest = max(self.highest, other.highest)
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self._int_total += other._int_total
+        for partial in other._partials:
+            self._add_partial(partial)
+        if other.digest is not None:
+            self.digest.merge(other.digest)
+        return self
+    
+    def _add_partial(self, x):
+        _add_partial(self._partials, x)
+    
+    @property
+    def total(self):
+        """Sum of the grades (an int when every grade was an int)."""
+        return _partials_total(self._int_total, self._partials)
+    
+    @property
+    def variance(self):
+        """Population variance of the grades (0.0 with fewer than 2)."""
+        return self._m2 / self.count if self.count > 1 else 0.0
+    
+    def quantile(self, q):
+        """Estimated q-quantile of the grades (needs a compression)."""
+        if self.digest is None:
+            raise ValueError("aggregate was built without a compression")
+        return self.digest.quantile(q)
+    
+    def median(self):
+        """Estimated median grade (needs a compression)."""
+        return self.quantile(0.5)
+    
+    def stats(self):
+        """Stats dictionary in the calculate_student_stats format."""
+        return _make_stats(self.count, self.total, self.highest, self.lowest)
+
+
+class RunningGradeStats:
+    """
+    Per-student aggregates that stay current as grades arrive.
+    
+    Adding a grade updates only that student's StudentAggregate, and reads
+    return the stored aggregates instead of rescanning every grade. When a
+    grade is removed or corrected, only that student's aggregate is rebuilt
+    from their own grades. Pass keep_grades=False to keep just the
+    aggregates (memory per student, not per grade); removals and
+    corrections are then not possible. Pass a compression to keep a
+    TDigest per student for quantiles.
+    
+    Example:
+        running = RunningGradeStats({'Alice': [85, 92]})
+        running.add_grade('Alice', 78)
+        running.student_stats('Alice')['average'] -> 85.0
+        running.correct_grade('Alice', 78, 88)
+        calculate_student_stats(running)['Alice']['average'] -> 88.33
+    """
+    
+    def __init__(self, grades_dict=None, keep_grades=True, compression=None):
+        self.compression = compression
+        self.aggregates = {}
+        self.grades = {} if keep_grades else None
+        for name, grades in (grades_dict or {}).items():
+            self.add_grades(name, grades)
+    
+    def add_grade(self, name, grade):
+        """Record a new grade for a student."""
+        aggregate = self.aggregates.get(name)
+        if aggregate is None:
+            aggregate = self._new_student(name)
+        aggregate.add(grade)
+        if self.grades is not None:
+            self.grades[name].append(grade)
+    
+    def add_grades(self, name, grades):
+        """Record several new grades for a student (none creates the student)."""
+        if name not in self.aggregates:
+            self._new_student(name)
+        for grade in grades:
+            self.add_grade(name, grade)
+    
+    def remove_grade(self, name, grade):
+        """Delete one occurrence of grade for a student."""
+        self._own_grades(name).remove(grade)
+        self._rebuild(name)
+    
+    def correct_grade(self, name, old_grade, new_grade):
+        """Replace one occurrence of old_grade with new_grade."""
+        grades = self._own_grades(name)
+        grades[grades.index(old_grade)] = new_grade
+        self._rebuild(name)
+    
+    def remove_student(self, name):
+        """Forget a student entirely."""
+        del self.aggregates[name]
+        if self.grades is not None:
+            del self.grades[name]
+    
+    def student_stats(self, name):
+        """Current stats of one student."""
+        return self.aggregates[name].stats()
+    
+    def stats(self):
+        """Current stats of every student, same format as calculate_student_stats."""
+        return {name: aggregate.stats() for name, aggregate in self.aggregates.items()}
+    
+    def student_quantile(self, name, q):
+        """Estimated q-quantile of one student's grades."""
+        return self.aggregates[name].quantile(q)
+    
+    def _new_student(self, name):
+        aggregate = self.aggregates[name] = StudentAggregate(compression=self.compression)
+        if self.grades is not None:
+            self.grades[name] = []
+        return aggregate
+    
+    def _own_grades(self, name):
+        return self._own_grades_dict()[name]
+    
+    def _own_grades_dict(self):
+        if self.grades is None:
+            raise ValueError("grades were not kept (keep_grades=False)")
+        return self.grades
+    
+    def _rebuild(self, name):
+        self.aggregates[name] = StudentAggregate(self.grades[name], self.compression)
+
+
+class TDigest:
+    """
+    Mergeable sketch for medians and percentiles of a stream of grades.
+    
+    A merging t-digest: values are kept as weighted centroids, small near
+    the extremes and larger in the middle, with at most about compression
+    centroids after each compress. Quantile error is roughly
+    1 / compression in rank, and much smaller near the tails. Digests built
+    on different partitions can be merged. New values are buffered in two
+    float64 arrays (16 bytes per value, half of what a list of floats
+    takes) and only compressed once more than 5 * compression are
+    waiting, so students with fewer grades than that get exact quantiles.
+    
+    Example:
+        digest = TDigest(compression=100)
+        for grade in [85, 92, 78, 96]:
+            digest.add(grade)
+        digest.quantile(0.5) -> 88.5
+    """
+    
+    def __init__(self, compression=100):
+        if compression < 10:
+            raise ValueError("compression must be at least 10")
+        self.compression = compression
+        self.count = 0
+        self.min = None
+        self.max = None
+        self._means = []
+        self._weights = []
+        self._buffer_means = array('d')
+        self._buffer_weights = array('d')
+    
+    def add(self, value, weight=1):
+        """Add a value (with an optional integer weight)."""
+        self._buffer_means.append(value)
+        self._buffer_weights.append(weight)
+        self.count += weight
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        if len(self._buffer_means) > 5 * self.compression:
+            self._compress()
+    
+    def merge(self, other):
+        """Fold another digest (e.g. from another partition) into this one."""
+        if not other.count:
+            return self
+        self._buffer_means.extend(other._means)
+        self._buffer_means.extend(other._buffer_means)
+        self._buffer_weights.extend(other._weights)
+        self._buffer_weights.extend(other._buffer_weights)
+        self.count += other.count
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        if len(self._buffer_means) > 5 * self.compression:
+            self._compress()
+        return self
+    
+    def _points(self):
+        """Centroids and buffered values as sorted (mean, weight) pairs."""
+        buffered = sorted(zip(self._buffer_means, self._buffer_weights))
+        return list(heapq.merge(zip(self._means, self._weights), buffered))
+    
+    def _compress(self):
+        """Merge buffered values into centroids under the k1 scale function."""
+        points = self._points()
+        self._buffer_means = array('d')
+        self._buffer_weights = array('d')
+        if not points:
+            return
+        total = self.count
+        scale = self.compression / (2 * math.pi)
+        means, weights = [], []
+        mean, weight = points[0]
+        cumulative = 0
+        k_low = scale * math.asin(-1.0)
+        for next_mean, next_weight in points[1:]:
+            q = (cumulative + weight + next_weight) / total
+            if scale * math.asin(min(1.0, 2 * q - 1)) - k_low <= 1:
+                weight += next_weight
+                mean += (next_mean - mean) * next_weight / weight
+            else:
+                means.append(mean)
+                weights.append(weight)
+                cumulative += weight
+                k_low = scale * math.asin(min(1.0, 2 * cumulative / total - 1))
+                mean, weight = next_mean, next_weight
+        means.append(mean)
+        weights.append(weight)
+        self._means, self._weights = means, weights
+    
+    def quantile(self, q):
+        """Estimated value below which a fraction q of the values fall."""
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        if not self.count:
+            return None
+        points = self._points()
+        means = [mean for mean, _ in points]
+        weights = [weight for _, weight in points]
+        if len(means) == 1:
+            return means[0]
+        target = q * self.count
+        # each centroid's mean sits at the middle of its weight
+        center = weights[0] / 2
+        if target <= center:
+            if weights[0] == 1:
+                return means[0]
+            return self.min + (means[0] - self.min) * target / center
+        for i in range(1, len(means)):
+            next_center = center + (weights[i - 1] + weights[i]) / 2
+            if target <= next_center:
+                fraction = (target - center) / (next_center - center)
+                return means[i - 1] + (means[i] - means[i - 1]) * fraction
+            center = next_center
+        if weights[-1] == 1:
+            return means[-1]
+        remaining = self.count - center
+        return means[-1] + (self.max - means[-1]) * (target - center) / remaining
+    
+    def __len__(self):
+        return self.count
+
+
+def cohort_digest(aggregates, names=None):
+    """
+    Merge the t-digests of many students into one, for cohort percentiles.
+    
+    Args:
+        aggregates (dict or RunningGradeStats): {name: StudentAggregate}
+                                                built with a compression
+        names (iterable): Students in the cohort (default: everyone)
+        
+    Returns:
+        TDigest: Digest of all the cohort's grades
+        
+    Example:
+        running = RunningGradeStats(grades, compression=100)
+        cohort_digest(running, ['Alice', 'Bob']).quantile(0.9)
     """
-    # TODO: Implement this function
-    pass
+    if isinstance(aggregates, RunningGradeStats):
+        aggregates = aggregates.aggregates
+    if names is None:
+        names = list(aggregates)
+    digests = [aggregates[name].digest for name in names]
+    if any(digest is None for digest in digests):
+        raise ValueError("aggregates were built without a compression")
+    result = TDigest(digests[0].compression if digests else 100)
+    for digest in digests:
+        result.merge(digest)
+    return result
 
 
 def get_top_students(grades_dict, n=3):
@@ -42,7 +609,10 @@ def get_top_students(grades_dict, n=3):
     Get the top N students based on their average grades.
     
     Args:
-        grades_dict (dict): Dictionary of student grades
+        grades_dict (dict): Dictionary of student grades, anything else
+                            calculate_student_stats accepts, or an index
+                            with a top(n) method (Leaderboard, RankIndex,
+                            ThresholdIndex and the grade containers)
         n (int): Number of top students to return (default: 3)
         
     Returns:
@@ -55,9 +625,189 @@ def get_top_students(grades_dict, n=3):
             'Charlie': [95, 87, 91, 89, 93]
         }
         get_top_students(grades, 2) -> [('Charlie', 91.0), ('Alice', 87.75)]
+        
+    Note:
+        Students with the same average are ordered by name. A heap keeps
+        only the best n while scanning, so one call costs O(s log n) for s
+        students; keep a Leaderboard to answer repeated calls in O(n).
+    """
+    top = getattr(grades_dict, 'top', None)
+    if top is not None:
+        return top(n)
+    return heapq.nsmallest(max(n, 0), _averages(grades_dict).items(), key=_rank_key)
+
+
+def _rank_key(item):
+    """Sort key putting higher averages first and ties in name order."""
+    name, average = item
+    return (-average, name)
+
+
+def _count_at_least(order, threshold):
+    """How many entries of a sorted (-average, name) list have average >= threshold."""
+    low, high = 0, len(order)
+    while low < high:
+        middle = (low + high) // 2
+        if -order[middle][0] >= threshold:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+class Leaderboard:
+    """
+    Students kept in ranking order as their averages change.
+    
+    Entries are held in a list sorted by (-average, name), so reading the
+    top n is a slice of O(n), and updating one student is a binary search
+    plus one list insert/delete.
+    
+    Example:
+        board = Leaderboard.from_grades({'Alice': [90], 'Bob': [80]})
+        board.update('Bob', 95.0)
+        board.top(1) -> [('Bob', 95.0)]
+        get_top_students(board, 2) -> [('Bob', 95.0), ('Alice', 90.0)]
+    """
+    
+    def __init__(self, averages=None):
+        self._averages = dict(averages or {})
+        self._order = sorted((-average, name) for name, average in self._averages.items())
+    
+    @classmethod
+    def from_grades(cls, grades_dict):
+        """Build from anything calculate_student_stats accepts."""
+        return cls(_averages(grades_dict))
+    
+    def update(self, name, average):
+        """Set a student's average, adding the student if new."""
+        if name in self._averages:
+            self._discard(name)
+        self._averages[name] = average
+        insort(self._order, (-average, name))
+    
+    def remove(self, name):
+        """Take a student off the leaderboard."""
+        self._discard(name)
+        del self._averages[name]
+    
+    def top(self, n=3):
+        """The best n students as (name, average) tuples."""
+        return [(name, -negative) for negative, name in self._order[:max(n, 0)]]
+    
+    def above(self, threshold):
+        """Names with average >= threshold, alphabetically."""
+        return sorted(name for _, name in self._order[:_count_at_least(self._order, threshold)])
+    
+    def average_of(self, name):
+        """Current average of a student."""
+        return self._averages[name]
+    
+    def __len__(self):
+        return len(self._order)
+    
+    def __contains__(self, name):
+        return name in self._averages
+    
+    def _discard(self, name):
+        """Delete a student's entry from the order and return its position."""
+        position = bisect_left(self._order, (-self._averages[name], name))
+        del self._order[position]
+        return position
+
+
+class RankIndex(Leaderboard):
+    """
+    Rank of every student, from one sort by (-average, name).
+    
+    A Leaderboard that also keeps three kinds of rank per position:
+    'competition' (ties share the best rank and the next rank skips,
+    1, 2, 2, 4), 'dense' (ties share a rank and none are skipped,
+    1, 2, 2, 3) and 'ordinal' (the 1-based position, ties broken by name). rank_of is a dictionary
+    lookup, and ranked(first, last) finds its k students with a binary
+    search over the rank column and returns them in O(log s + k).
+    
+    update() moves the changed students with a binary search and a list
+    insert each, then recomputes positions and ranks only from the
+    highest changed position down, without sorting again.
+    
+    Example:
+        ranks = RankIndex.from_grades({'Alice': [90], 'Bob': [95], 'Carol': [90], 'Dan': [80]})
+        ranks.rank_of('Carol') -> 2
+        ranks.rank_of('Dan') -> 4
+        ranks.rank_of('Dan', 'dense') -> 3
+        ranks.ranked(2, 3) -> [('Alice', 90.0, 2), ('Carol', 90.0, 2)]
+        ranks.update({'Dan': 99.0})
+        ranks.rank_of('Dan') -> 1
     """
-    # TODO: Implement this function
-    pass
+    
+    METHODS = ('competition', 'dense', 'ordinal')
+    
+    def __init__(self, averages=None):
+        super().__init__(averages)
+        self._position = {}
+        self._ranks = {'competition': [], 'dense': [], 'ordinal': []}
+        self._refresh(0)
+    
+    def rank_of(self, name, method='competition'):
+        """Rank of one student in O(1)."""
+        return self._rank_column(method)[self._position[name]]
+    
+    def ranked(self, first, last, method='competition'):
+        """Students whose rank is in [first, last] as (name, average, rank), best first."""
+        ranks = self._rank_column(method)
+        start, stop = bisect_left(ranks, first), bisect_right(ranks, last)
+        return [(name, -negative, ranks[position]) for position, (negative, name)
+                in enumerate(self._order[start:stop], start)]
+    
+    def update(self, averages, average=None):
+        """
+        Set the averages of some students, adding any that are new.
+        
+        Takes a {name: average} dictionary, or one student as
+        update(name, average) like Leaderboard.update.
+        """
+        if not hasattr(averages, 'items'):
+            averages = {averages: average}
+        start = len(self._order)
+        for name, average in averages.items():
+            if name in self._averages:
+                start = min(start, self._discard(name))
+            self._averages[name] = average
+            key = (-average, name)
+            position = bisect_left(self._order, key)
+            self._order.insert(position, key)
+            start = min(start, position)
+        self._refresh(start)
+    
+    def remove(self, name):
+        """Take a student out of the ranking."""
+        start = self._discard(name)
+        del self._averages[name]
+        del self._position[name]
+        self._refresh(start)
+    
+    def _rank_column(self, method):
+        if method not in self._ranks:
+            raise ValueError("method must be one of %s" % ', '.join(self.METHODS))
+        return self._ranks[method]
+    
+    def _refresh(self, start):
+        """Recompute positions and ranks from position start to the end."""
+        order, position_of = self._order, self._position
+        competition, dense, ordinal = (self._ranks[method] for method in self.METHODS)
+        for column in (competition, dense, ordinal):
+            del column[start:]
+        for position in range(start, len(order)):
+            negative, name = order[position]
+            position_of[name] = position
+            if position and order[position - 1][0] == negative:
+                competition.append(competition[-1])
+                dense.append(dense[-1])
+            else:
+                competition.append(position + 1)
+                dense.append(dense[-1] + 1 if position else 1)
+            ordinal.append(position + 1)
 
 
 def students_above_threshold(grades_dict, threshold):
@@ -65,7 +815,10 @@ def students_above_threshold(grades_dict, threshold):
     Find students whose average grade is above the given threshold.
     
     Args:
-        grades_dict (dict): Dictionary of student grades
+        grades_dict (dict): Dictionary of student grades, anything else
+                            calculate_student_stats accepts, or an index
+                            with an above(threshold) method (ThresholdIndex,
+                            Leaderboard, RankIndex and the grade containers)
         threshold (float): Minimum average grade threshold
         
     Returns:
@@ -79,5 +832,1010 @@ def students_above_threshold(grades_dict, threshold):
         }
         students_above_threshold(grades, 90) -> ['Charlie']
     """
-    # TODO: Implement this function
-    pass
+    above = getattr(grades_dict, 'above', None)
+    if above is not None:
+        return above(threshold)
+    return sorted(name for name, average in _averages(grades_dict).items()
+                  if average >= threshold)
+
+
+class ThresholdIndex:
+    """
+    Reusable index for many threshold and range queries on one grade set.
+    
+    Built once in O(s log s) for s students: averages sorted for bisect
+    lookups, plus the alphabetical position of every student. A query
+    finds its m matching students with two binary searches and then
+    returns them alphabetically, by sorting their m positions when m is
+    small or by one pass over the alphabetical list when m is large, so it
+    costs O(log s + min(m log m, s)).
+    
+    Example:
+        index = ThresholdIndex(grades)
+        index.above(90) -> ['Charlie', 'Diana']
+        index.between(85, 90) -> ['Alice', 'Bob']
+        index.batch_above([80, 90, 95]) -> [[...4 names], [...2 names], ['Diana']]
+    """
+    
+    def __init__(self, grades_dict):
+        averages = _averages(grades_dict)
+        self.names = sorted(averages)
+        self._average_by_position = [averages[name] for name in self.names]
+        order = sorted(range(len(self.names)), key=self._average_by_position.__getitem__)
+        self._sorted_averages = [self._average_by_position[i] for i in order]
+        self._position_by_rank = order
+    
+    def __len__(self):
+        return len(self.names)
+    
+    def top(self, n=3):
+        """The best n students as (name, average), ties for the last place included by name."""
+        n = min(max(n, 0), len(self.names))
+        if not n:
+            return []
+        start = bisect_left(self._sorted_averages, self._sorted_averages[-n])
+        candidates = [(self.names[position], self._average_by_position[position])
+                      for position in self._position_by_rank[start:]]
+        return heapq.nsmallest(n, candidates, key=_rank_key)
+    
+    def count_above(self, threshold):
+        """Number of students with average >= threshold, in O(log s)."""
+        return len(self.names) - bisect_left(self._sorted_averages, threshold)
+    
+    def above(self, threshold):
+        """Names with average >= threshold, alphabetically."""
+        start = bisect_left(self._sorted_averages, threshold)
+        return self._names_between_ranks(start, len(self.names))
+    
+    def between(self, low, high):
+        """Names with low <= average <= high, alphabetically."""
+        start = bisect_left(self._sorted_averages, low)
+        stop = bisect_right(self._sorted_averages, high)
+        return self._names_between_ranks(start, max(start, stop))
+    
+    def batch_above(self, thresholds):
+        """
+        Answer students_above_threshold for many thresholds in one sweep.
+        
+        Thresholds are visited from highest to lowest, so each answer only
+        merges the newly qualifying students into the previous one.
+        
+        Returns:
+            list: One alphabetical name list per threshold, in input order
+        """
+        answers = [None] * len(thresholds)
+        current = []
+        rank = len(self.names)
+        for i in sorted(range(len(thresholds)), key=thresholds.__getitem__, reverse=True):
+            start = bisect_left(self._sorted_averages, thresholds[i])
+            if start < rank:
+                new = sorted(self._position_by_rank[start:rank])
+                current = list(heapq.merge(current, new))
+                rank = start
+            answers[i] = [self.names[position] for position in current]
+        return answers
+    
+    def _names_between_ranks(self, start, stop):
+        """Names whose average rank is in [start, stop), alphabetically."""
+        count = stop - start
+        if count <= 0:
+            return []
+        if count * max(1, count.bit_length()) < len(self.names):
+            positions = sorted(self._position_by_rank[start:stop])
+            return [self.names[position] for position in positions]
+        low = self._sorted_averages[start]
+        high = self._sorted_averages[stop - 1]
+        return [name for name, average in zip(self.names, self._average_by_position)
+                if low <= average <= high]
+
+
+def load_grade_aggregates(path, file_format=None, name_field='name',
+                          grade_field='grade', chunk_size=100000, running=None,
+                          workers=None, compression=None):
+    """
+    Stream a CSV or JSONL grade export into per-student aggregates.
+    
+    Rows are read a chunk at a time and folded straight into one
+    StudentAggregate per student, so memory grows with the number of
+    students, not the number of grades. The result works with
+    calculate_student_stats, get_top_students and students_above_threshold.
+    
+    CSV files need a header row containing name_field and grade_field.
+    JSONL files hold one object per line with name_field and either
+    grade_field (one grade) or grade_field + 's' (a list of grades).
+    
+    With workers=N the file is cut into N byte ranges on line boundaries;
+    each process aggregates its range and the partial aggregates are
+    merged, giving the same stats as a serial load. This assumes one
+    record per line (no line breaks inside quoted CSV fields).
+    
+    Args:
+        path (str): File to read
+        file_format (str): 'csv' or 'jsonl' (default: from the extension)
+        name_field (str): Column / key holding the student name
+        grade_field (str): Column / key holding the grade
+        chunk_size (int): Rows parsed per batch
+        running (RunningGradeStats): Existing aggregate-only stats to add to
+        workers (int): Number of processes to split the file across
+        compression (int): Keep a mergeable TDigest per student for
+                           quantiles, with this accuracy setting
+        
+    Returns:
+        RunningGradeStats: Aggregates only (keep_grades=False)
+        
+    Example:
+        grades.csv:
+            name,grade
+            Alice,85
+            Bob,76
+            Alice,92
+        load_grade_aggregates('grades.csv').student_stats('Alice')['average'] -> 88.5
+    """
+    if running is None:
+        running = RunningGradeStats(keep_grades=False, compression=compression)
+    elif running.grades is not None:
+        raise ValueError("running must be created with keep_grades=False")
+    aggregates = running.aggregates
+    if workers and workers > 1:
+        file_format = _file_format(path, file_format)
+        tasks = [(path, file_format, name_field, grade_field, start, end,
+                  running.compression)
+                 for start, end in _byte_ranges(path, file_format, workers)]
+        with ProcessPoolExecutor(workers) as pool:
+            _merge_aggregates(pool.map(_aggregate_range, tasks), aggregates)
+        return running
+    for chunk in iter_grade_chunks(path, file_format, name_field, grade_field, chunk_size):
+        for name, grade in chunk:
+            aggregate = aggregates.get(name)
+            if aggregate is None:
+                aggregate = running._new_student(name)
+            aggregate.add(grade)
+    return running
+
+
+def iter_grade_chunks(path, file_format=None, name_field='name',
+                      grade_field='grade', chunk_size=100000):
+    """
+    Yield lists of up to chunk_size (name, grade) pairs from a grade export.
+    
+    See load_grade_aggregates for the accepted formats.
+    """
+    rows = _iter_grade_rows(path, _file_format(path, file_format), name_field, grade_field)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _file_format(path, file_format):
+    """Pick 'csv' or 'jsonl' from the argument or the file extension."""
+    if file_format is None:
+        extension = os.path.splitext(str(path))[1].lower()
+        file_format = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl'}.get(extension)
+    if file_format not in ('csv', 'jsonl'):
+        raise ValueError("file_format must be 'csv' or 'jsonl'")
+    return file_format
+
+
+def _iter_grade_rows(path, file_format, name_field, grade_field, start=0, end=None):
+    """
+    Yield (name, grade) pairs from a CSV or JSONL file.
+    
+    Only lines starting at a byte offset in [start, end) are read, so
+    adjacent byte ranges split one file into disjoint sets of rows.
+    """
+    with open(path, 'rb') as handle:
+        data_start = 0
+        if file_format == 'csv':
+            header_line = handle.readline()
+            if not header_line:
+                return
+            header = next(csv.reader([header_line.decode('utf-8-sig')]))
+            try:
+                name_column = header.index(name_field)
+                grade_column = header.index(grade_field)
+            except ValueError:
+                raise ValueError("CSV header must contain %r and %r" % (name_field, grade_field))
+            data_start = len(header_line)
+        lines = _iter_lines(handle, max(start, data_start), end, data_start)
+        if file_format == 'csv':
+            for row in csv.reader(lines):
+                if row:
+                    yield sys.intern(row[name_column]), _parse_grade(row[grade_column])
+        else:
+            list_field = grade_field + 's'
+            for line in lines:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                name = sys.intern(record[name_field])
+                if grade_field in record:
+                    yield name, record[grade_field]
+                else:
+                    for grade in record[list_field]:
+                        yield name, grade
+
+
+def _iter_lines(handle, start, end, data_start):
+    """Decoded lines of a binary file that start in [start, end)."""
+    if start > data_start:
+        # finish the line cut by start; it belongs to the previous range
+        handle.seek(start - 1)
+        position = start - 1 + len(handle.readline())
+    else:
+        handle.seek(start)
+        position = start
+    while end is None or position < end:
+        line = handle.readline()
+        if not line:
+            return
+        position += len(line)
+        yield line.decode('utf-8')
+
+
+def _byte_ranges(path, file_format, parts):
+    """Split the data part of a grade file into parts (start, end) ranges."""
+    data_start = 0
+    if file_format == 'csv':
+        with open(path, 'rb') as handle:
+            data_start = len(handle.readline())
+    size = os.path.getsize(path)
+    step = max(1, -(-(size - data_start) // parts))
+    return [(start, min(start + step, size)) for start in range(data_start, size, step)]
+
+
+def _aggregate_range(task):
+    """Worker: partial aggregates for the rows in one byte range of a file."""
+    path, file_format, name_field, grade_field, start, end, compression = task
+    aggregates = {}
+    for name, grade in _iter_grade_rows(path, file_format, name_field, grade_field,
+                                        start, end):
+        aggregate = aggregates.get(name)
+        if aggregate is None:
+            aggregate = aggregates[name] = StudentAggregate(compression=compression)
+        aggregate.add(grade)
+    return aggregates
+
+
+def _aggregate_students(items):
+    """Worker: one aggregate per (name, grades) item."""
+    return {name: StudentAggregate(grades) for name, grades in items}
+
+
+def _merge_aggregates(partials, into):
+    """Reducer: merge {name: StudentAggregate} partials, in order, into into."""
+    for partial in partials:
+        for name, aggregate in partial.items():
+            existing = into.get(name)
+            if existing is None:
+                into[name] = aggregate
+            else:
+                existing.merge(aggregate)
+    return into
+
+
+def _parse_grade(text):
+    """Parse a CSV grade, keeping whole numbers as ints."""
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+# Binary snapshot layout (all little-endian, every section 8-byte aligned):
+#   header: magic, version, flags, student count, grade count, then an
+#           (offset, byte length) pair for each entry of _SNAPSHOT_SECTIONS
+#   name_index int64[n+1]   byte offsets of each name in names
+#   names      utf-8        all names back to back
+#   offsets    int64[n+1]   student i owns grades[offsets[i]:offsets[i+1]]
+#   grades     float64[g]
+#   totals, highest, lowest, averages  float64[n]  precomputed aggregates
+#   ranking    int64[n]     students by (-average, name)
+#   by_name    int64[n]     students in alphabetical order
+_SNAPSHOT_MAGIC = b'GRADES\x00\x01'
+_SNAPSHOT_VERSION = 1
+_SNAPSHOT_SECTIONS = ('name_index', 'names', 'offsets', 'grades', 'totals',
+                      'highest', 'lowest', 'averages', 'ranking', 'by_name')
+_SNAPSHOT_HEADER = struct.Struct('<8sIIQQ' + 'QQ' * len(_SNAPSHOT_SECTIONS))
+_SNAPSHOT_FORMATS = {'names': 'B', 'grades': 'd', 'totals': 'd', 'highest': 'd',
+                     'lowest': 'd', 'averages': 'd'}
+_FLAG_INTEGRAL = 1
+
+
+def save_snapshot(grades_dict, path):
+    """
+    Write grades to a compact binary snapshot that GradeSnapshot can mmap.
+    
+    Besides the columnar grades (see GradeBook), the file stores each
+    student's total, highest, lowest and rounded average, plus the
+    ranking and alphabetical orders, so queries on the opened snapshot do
+    not need to look at the grades at all. Totals are summed exactly like
+    calculate_student_stats does, so the stored averages and ranking
+    match the dictionary path.
+    
+    Args:
+        grades_dict (dict): Dictionary of student grades, a GradeBook, or a
+                            RunningGradeStats that kept its grades
+        path (str): File to write
+        
+    Example:
+        save_snapshot(grades, 'grades.snap')
+        with GradeSnapshot('grades.snap') as snapshot:
+            get_top_students(snapshot, 2) -> [('Charlie', 91.0), ('Alice', 87.75)]
+    """
+    if sys.byteorder != 'little':
+        raise ValueError("snapshots can only be written on little-endian hosts")
+    if isinstance(grades_dict, RunningGradeStats):
+        grades_dict = grades_dict._own_grades_dict()
+    book = grades_dict if isinstance(grades_dict, GradeBook) else GradeBook.from_dict(grades_dict)
+    counts, totals, highest, lowest = book._reduce()
+    averages = [_make_stats(count, total, None, None)['average']
+                for count, total in zip(counts, totals)]
+    nan = float('nan')
+    encoded = [name.encode('utf-8') for name in book.names]
+    name_index = array('q', [0])
+    for blob in encoded:
+        name_index.append(name_index[-1] + len(blob))
+    sections = {
+        'name_index': name_index,
+        'names': b''.join(encoded),
+        'offsets': book.offsets,
+        'grades': book.grades,
+        'totals': array('d', totals),
+        'highest': array('d', [nan if not count else value
+                               for count, value in zip(counts, highest)]),
+        'lowest': array('d', [nan if not count else value
+                              for count, value in zip(counts, lowest)]),
+        'averages': array('d', averages),
+        'ranking': array('q', sorted(range(len(book)),
+                                     key=lambda i: (-averages[i], book.names[i]))),
+        'by_name': array('q', sorted(range(len(book)), key=book.names.__getitem__)),
+    }
+
+    table = []
+    position = _SNAPSHOT_HEADER.size
+    for name in _SNAPSHOT_SECTIONS:
+        position += -position % 8
+        size = len(memoryview(sections[name]).cast('B'))
+        table.extend((position, size))
+        position += size
+    header = _SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, _SNAPSHOT_VERSION,
+                                   _FLAG_INTEGRAL if book.integral else 0,
+                                   len(book), len(book.grades), *table)
+    with open(path, 'wb') as handle:
+        handle.write(header)
+        for name, offset in zip(_SNAPSHOT_SECTIONS, table[::2]):
+            handle.write(b'\0' * (offset - handle.tell()))
+            handle.write(sections[name])
+
+
+class GradeSnapshot:
+    """
+    Read-only, memory-mapped view of a file written by save_snapshot.
+    
+    Opening only parses the fixed-size header; every column is a zero-copy
+    memoryview into the mapping, so startup takes milliseconds whatever
+    the file size and pages are read only when touched. Single-student
+    lookups use a binary search over the stored alphabetical order, and
+    get_top_students reads the stored ranking in O(n).
+    
+    Example:
+        with GradeSnapshot('grades.snap') as snapshot:
+            snapshot.student_stats('Alice')['average'] -> 87.75
+            students_above_threshold(snapshot, 90) -> ['Charlie', 'Diana']
+    """
+    
+    def __init__(self, path):
+        if sys.byteorder != 'little':
+            raise ValueError("snapshots can only be read on little-endian hosts")
+        with open(path, 'rb') as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        fields = _SNAPSHOT_HEADER.unpack_from(self._mmap)
+        magic, version, flags, self._count, self._grade_count = fields[:5]
+        if magic != _SNAPSHOT_MAGIC or version != _SNAPSHOT_VERSION:
+            self._mmap.close()
+            raise ValueError("%s is not a version %d grade snapshot" % (path, _SNAPSHOT_VERSION))
+        self.integral = bool(flags & _FLAG_INTEGRAL)
+        data = memoryview(self._mmap)
+        self._views = [data]
+        table = fields[5:]
+        for i, name in enumerate(_SNAPSHOT_SECTIONS):
+            offset, size = table[2 * i], table[2 * i + 1]
+            view = data[offset:offset + size].cast(_SNAPSHOT_FORMATS.get(name, 'q'))
+            self._views.append(view)
+            setattr(self, '_' + name, view)
+    
+    def close(self):
+        """Release the views and unmap the file."""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mmap.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def __len__(self):
+        return self._count
+    
+    def name(self, index):
+        """Name of the student stored at position index."""
+        return bytes(self._names[self._name_index[index]:self._name_index[index + 1]]).decode('utf-8')
+    
+    def index_of(self, name):
+        """Position of a student, found by binary search; KeyError if absent."""
+        by_name = self._by_name
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self.name(by_name[middle]) < name:
+                low = middle + 1
+            else:
+                high = middle
+        if low == self._count or self.name(by_name[low]) != name:
+            raise KeyError(name)
+        return by_name[low]
+    
+    def grades_of(self, name):
+        """One student's grades as a zero-copy float64 memoryview (release it before close)."""
+        index = self.index_of(name)
+        return self._grades[self._offsets[index]:self._offsets[index + 1]]
+    
+    def _stats_at(self, index):
+        count = self._offsets[index + 1] - self._offsets[index]
+        if not count:
+            return _make_stats(0, 0, None, None)
+        convert = int if self.integral else float
+        return {
+            'average': self._averages[index],
+            'highest': convert(self._highest[index]),
+            'lowest': convert(self._lowest[index]),
+            'total_assignments': count,
+        }
+    
+    def student_stats(self, name):
+        """Stats of one student in O(log n)."""
+        return self._stats_at(self.index_of(name))
+    
+    def stats(self):
+        """Stats of every student, same format as calculate_student_stats."""
+        return {self.name(i): self._stats_at(i) for i in range(self._count)}
+    
+    def top(self, n=3):
+        """The best n students as (name, average), read from the stored ranking."""
+        return [(self.name(i), self._averages[i]) for i in self._ranking[:max(n, 0)]]
+    
+    def above(self, threshold):
+        """Names with average >= threshold, alphabetically."""
+        ranking, averages = self._ranking, self._averages
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if averages[ranking[middle]] >= threshold:
+                low = middle + 1
+            else:
+                high = middle
+        return sorted(self.name(i) for i in ranking[:low])
+
+
+_STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS grades (student TEXT NOT NULL, grade);
+CREATE INDEX IF NOT EXISTS grades_by_student ON grades (student);
+CREATE TABLE IF NOT EXISTS students (
+    name TEXT PRIMARY KEY,
+    count INTEGER NOT NULL,
+    int_total INTEGER NOT NULL,
+    partials BLOB NOT NULL,
+    total,
+    highest,
+    lowest,
+    average REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS students_by_average ON students (average DESC, name);
+"""
+
+_STORE_UPSERT = """
+INSERT INTO students (name, count, int_total, partials, total, highest, lowest, average)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (name) DO UPDATE SET
+    count = excluded.count,
+    int_total = excluded.int_total,
+    partials = excluded.partials,
+    total = excluded.total,
+    highest = excluded.highest,
+    lowest = excluded.lowest,
+    average = excluded.average
+"""
+
+
+class GradeStore:
+    """
+    Grades kept in a SQLite database, for data sets larger than memory or
+    that must survive restarts.
+    
+    Every grade is a row of the grades table; the students table holds one
+    aggregate row per student (count, total, highest, lowest, average),
+    and an index on (average DESC, name). Each insert batch reads the rows
+    of the students it touches, folds the batch's grades into them and
+    upserts them back, so a batch costs O(batch), not O(grades stored).
+    get_top_students reads the first n entries of that index and
+    students_above_threshold is a range scan over it, so neither touches
+    the individual grades.
+    
+    Grade values keep their type, so whole-number grades stay ints. Each
+    row keeps an exact running total, the integer part plus the Shewchuk
+    partials of the float part (see StudentAggregate) as a BLOB, so the
+    averages match calculate_student_stats exactly however the grades
+    were batched.
+    
+    Args:
+        path (str): Database file, or ':memory:' (default) for a private
+                    in-memory database
+        
+    Example:
+        with GradeStore('grades.db') as store:
+            store.add_rows([('Alice', 85), ('Bob', 76), ('Alice', 92)])
+            get_top_students(store, 1) -> [('Alice', 88.5)]
+            students_above_threshold(store, 80) -> ['Alice']
+    """
+    
+    def __init__(self, path=':memory:'):
+        self.path = path
+        self._db = sqlite3.connect(path)
+        with self._db:
+            self._db.executescript(_STORE_SCHEMA)
+    
+    @classmethod
+    def from_grades(cls, grades_dict, path=':memory:'):
+        """Create a store holding a dictionary of student grades."""
+        store = cls(path)
+        store.update(grades_dict)
+        return store
+    
+    def close(self):
+        """Close the database connection."""
+        self._db.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM students").fetchone()[0]
+    
+    def __contains__(self, name):
+        return self._db.execute("SELECT 1 FROM students WHERE name = ?",
+                                (name,)).fetchone() is not None
+    
+    def add_grade(self, name, grade):
+        """Record one grade."""
+        self.add_rows([(name, grade)])
+    
+    def add_grades(self, name, grades):
+        """Record several grades of one student; an empty list just registers the student."""
+        grades = list(grades)
+        if grades:
+            self.add_rows((name, grade) for grade in grades)
+        else:
+            with self._db:
+                self._db.execute("INSERT OR IGNORE INTO students "
+                                 "VALUES (?, 0, 0, x'', 0, NULL, NULL, 0.0)", (name,))
+    
+    def update(self, grades_dict):
+        """Add every student's grades from a dictionary of grade lists."""
+        for name, grades in grades_dict.items():
+            self.add_grades(name, grades)
+    
+    def add_rows(self, rows, batch_size=10000):
+        """
+        Insert (name, grade) pairs, batch_size rows per transaction.
+        
+        Each batch is one executemany into grades, one read of the
+        aggregate rows of the students in the batch, and one executemany
+        upsert of those rows, all in one write transaction.
+        """
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                return
+            by_student = {}
+            for name, grade in batch:
+                by_student.setdefault(name, []).append(grade)
+            with self._db:
+                # take the write lock before reading the rows we rewrite
+                self._db.execute("BEGIN IMMEDIATE")
+                self._db.executemany("INSERT INTO grades (student, grade) VALUES (?, ?)", batch)
+                stored = self._aggregate_rows(list(by_student))
+                self._db.executemany(_STORE_UPSERT, [
+                    self._fold(name, grades, stored.get(name))
+                    for name, grades in by_student.items()])
+    
+    def load_file(self, path, file_format=None, name_field='name', grade_field='grade',
+                  batch_size=10000):
+        """Insert the rows of a CSV or JSONL export (see load_grade_aggregates)."""
+        self.add_rows(_iter_grade_rows(path, _file_format(path, file_format),
+                                       name_field, grade_field), batch_size)
+    
+    def remove_student(self, name):
+        """Delete a student and all their grades; KeyError if absent."""
+        with self._db:
+            if not self._db.execute("DELETE FROM students WHERE name = ?", (name,)).rowcount:
+                raise KeyError(name)
+            self._db.execute("DELETE FROM grades WHERE student = ?", (name,))
+    
+    def grades_of(self, name):
+        """One student's grades in insertion order."""
+        return [grade for grade, in self._db.execute(
+            "SELECT grade FROM grades WHERE student = ? ORDER BY rowid", (name,))]
+    
+    def student_stats(self, name):
+        """Stats of one student from the aggregate table; KeyError if absent."""
+        row = self._db.execute("SELECT count, highest, lowest, average FROM students "
+                               "WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            raise KeyError(name)
+        return self._row_stats(row)
+    
+    def stats(self):
+        """Stats of every student, same format as calculate_student_stats."""
+        return {row[0]: self._row_stats(row[1:]) for row in self._db.execute(
+            "SELECT name, count, highest, lowest, average FROM students")}
+    
+    def top(self, n=3):
+        """The best n students as (name, average), read off the average index."""
+        return self._db.execute("SELECT name, average FROM students "
+                                "ORDER BY average DESC, name LIMIT ?", (max(n, 0),)).fetchall()
+    
+    def above(self, threshold):
+        """Names with average >= threshold, alphabetically, via an index range scan."""
+        # sorting the m matches here keeps SQLite on the average index
+        # instead of walking the primary key in name order
+        return sorted(name for name, in self._db.execute(
+            "SELECT name FROM students WHERE average >= ?", (threshold,)))
+    
+    def _aggregate_rows(self, names, chunk=500):
+        """Stored (count, int_total, partials, highest, lowest) of the given students."""
+        rows = {}
+        for start in range(0, len(names), chunk):
+            part = names[start:start + chunk]
+            rows.update((row[0], row[1:]) for row in self._db.execute(
+                "SELECT name, count, int_total, partials, highest, lowest FROM students "
+                "WHERE name IN (%s)" % ', '.join('?' * len(part)), part))
+        return rows
+    
+    @staticmethod
+    def _fold(name, grades, row):
+        """Upsert parameters for a student's row with grades folded in."""
+        if row is None:
+            count, int_total, partials, highest, lowest = 0, 0, [], None, None
+        else:
+            count, int_total, blob, highest, lowest = row
+            stored = array('d')
+            stored.frombytes(blob)
+            partials = stored.tolist()
+        for grade in grades:
+            if type(grade) is int:
+                int_total += grade
+            else:
+                _add_partial(partials, float(grade))
+        count += len(grades)
+        high, low = max(grades), min(grades)
+        highest = high if highest is None else max(highest, high)
+        lowest = low if lowest is None else min(lowest, low)
+        total = _partials_total(int_total, partials)
+        return (name, count, int_total, array('d', partials).tobytes(), total, highest, lowest,
+                _make_stats(count, total, None, None)['average'])
+    
+    @staticmethod
+    def _row_stats(row):
+        count, highest, lowest, average = row
+        return {
+            'average': average,
+            'highest': highest,
+            'lowest': lowest,
+            'total_assignments': count,
+        }
+
+
+class StatsCache:
+    """
+    Grade data with cached stats, top-N and threshold answers.
+    
+    Every student has a version counter and the data set has a global
+    version; both go up whenever a student's grades change. A student's
+    stats are cached with the student version they were computed at, and
+    top-N / threshold results with the data set version, so a change to
+    one student recomputes only that student's stats and the rankings
+    (which reuse every other student's cached stats). Ranking results are
+    kept for at most max_derived distinct queries per data set version.
+    
+    hits and misses count cache lookups of both kinds; cache_info()
+    reports them together with the cache sizes.
+    
+    Example:
+        cache = StatsCache({'Alice': [85, 92], 'Bob': [76, 88]})
+        get_top_students(cache, 1) -> [('Alice', 88.5)]
+        get_top_students(cache, 1)  # hit
+        cache.add_grade('Bob', 100)  # invalidates Bob and the rankings only
+        cache.cache_info() -> {'hits': 1, 'misses': 3, 'students': 1, 'rankings': 0}
+    """
+    
+    def __init__(self, grades_dict=None, max_derived=1024):
+        self.max_derived = max_derived
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._grades = {}
+        self._versions = {}
+        self._entries = {}
+        self._derived = {}
+        self._derived_version = 0
+        for name, grades in (grades_dict or {}).items():
+            self.set_grades(name, grades)
+    
+    def __len__(self):
+        return len(self._grades)
+    
+    def __contains__(self, name):
+        return name in self._grades
+    
+    def version_of(self, name):
+        """Version counter of one student."""
+        return self._versions[name]
+    
+    def grades_of(self, name):
+        """Copy of one student's grades."""
+        return list(self._grades[name])
+    
+    def set_grades(self, name, grades):
+        """Replace a student's grades, adding the student if new."""
+        self._grades[name] = list(grades)
+        self._touch(name)
+    
+    def add_grade(self, name, grade):
+        """Record a new grade for a student."""
+        self._grades.setdefault(name, []).append(grade)
+        self._touch(name)
+    
+    def add_grades(self, name, grades):
+        """Record several new grades for a student (none creates the student)."""
+        self._grades.setdefault(name, []).extend(grades)
+        self._touch(name)
+    
+    def remove_student(self, name):
+        """Forget a student entirely."""
+        del self._grades[name]
+        self._touch(name)
+        del self._versions[name]
+    
+    def student_stats(self, name):
+        """Stats of one student, recomputed only if they changed."""
+        version = self._versions[name]
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] == version:
+            self.hits += 1
+            return dict(entry[1])
+        self.misses += 1
+        stats = _grade_stats(self._grades[name])
+        self._entries[name] = (version, stats)
+        return dict(stats)
+    
+    def stats(self):
+        """Stats of every student, same format as calculate_student_stats."""
+        return {name: self.student_stats(name) for name in self._grades}
+    
+    def top(self, n=3):
+        """The best n students as (name, average)."""
+        n = max(n, 0)
+        return list(self._derive(('top', n), lambda: heapq.nsmallest(
+            n, self._averages().items(), key=_rank_key)))
+    
+    def above(self, threshold):
+        """Names with average >= threshold, alphabetically."""
+        return list(self._derive(('above', threshold), lambda: sorted(
+            name for name, average in self._averages().items() if average >= threshold)))
+    
+    def cache_info(self):
+        """Hit and miss counts plus the number of cached entries."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'students': len(self._entries),
+            'rankings': len(self._derived) if self._derived_version == self.version else 0,
+        }
+    
+    def _touch(self, name):
+        self._entries.pop(name, None)
+        self._versions[name] = self._versions.get(name, 0) + 1
+        self.version += 1
+    
+    def _averages(self):
+        return {name: self.student_stats(name)['average'] for name in self._grades}
+    
+    def _derive(self, key, compute):
+        if self._derived_version != self.version:
+            self._derived = {}
+            self._derived_version = self.version
+        result = self._derived.get(key)
+        if result is not None:
+            self.hits += 1
+            return result
+        self.misses += 1
+        if len(self._derived) >= self.max_derived:
+            self._derived = {}
+        result = self._derived[key] = compute()
+        return result
+
+
+class ConcurrentGradeBook:
+    """
+    Grade data shared between reader threads and writer threads.
+    
+    Students are spread over shards by hash of name. Each shard is an
+    immutable {name: record} dictionary that writers replace copy-on-write
+    while holding that shard's lock; readers only load the current
+    dictionary reference, so they never take a lock and never wait for
+    writers. Writers to different shards run independently.
+    
+    A record holds the student's append-only grades list with the number
+    of grades it covers, a StudentAggregate and the stats computed from
+    it, so a new grade costs O(1) plus copying its shard. The shard count
+    starts from the initial data (or shards) and doubles whenever shards
+    average more than SHARD_STUDENTS students: the resize takes every
+    shard lock, rehashes the records and publishes the new shards in one
+    assignment, and writers that raced with it retry. Batch many grades
+    through update() when streaming.
+    
+    Each student's grades and stats change atomically. A read spanning
+    several students (stats, top, above) sees every shard at some recent
+    state, but an update() touching several shards may be visible in some
+    of them only.
+    
+    Example:
+        book = ConcurrentGradeBook({'Alice': [85, 92]})
+        # in writer threads
+        book.add_grade('Bob', 76)
+        # in reader threads, lock-free
+        book.student_stats('Alice')['average'] -> 88.5
+        get_top_students(book, 1) -> [('Alice', 88.5)]
+    """
+    
+    SHARD_STUDENTS = 256
+    
+    def __init__(self, grades_dict=None, shards=None):
+        if shards is None:
+            shards = 16
+            while shards * self.SHARD_STUDENTS < len(grades_dict or ()):
+                shards *= 2
+        # (locks, tables) replaced as one value when the shards are resized
+        self._shards = ([threading.Lock() for _ in range(shards)], [{} for _ in range(shards)])
+        self._resize_lock = threading.Lock()
+        if grades_dict:
+            self.update(grades_dict)
+    
+    def __len__(self):
+        return sum(len(table) for table in self._shards[1])
+    
+    def __contains__(self, name):
+        return name in self._table_of(name)
+    
+    def add_grade(self, name, grade):
+        """Record a new grade for a student."""
+        self.update({name: [grade]})
+    
+    def add_grades(self, name, grades):
+        """Record several new grades for a student (none creates the student)."""
+        self.update({name: grades})
+    
+    def update(self, grades_dict):
+        """Append grades for many students, copying each touched shard once."""
+        # fold the new grades into fresh aggregates first: a bad grade
+        # raises here, before any published record is touched
+        pending = []
+        for name, grades in grades_dict.items():
+            grades = list(grades)
+            pending.append((name, grades, StudentAggregate(grades)))
+        grow = False
+        while pending:
+            shards = locks, tables = self._shards
+            by_shard = {}
+            for item in pending:
+                by_shard.setdefault(hash(item[0]) % len(tables), []).append(item)
+            pending = []
+            for shard, items in by_shard.items():
+                with locks[shard]:
+                    if self._shards is not shards:
+                        # resized meanwhile; retry these against the new shards
+                        pending.extend(items)
+                        continue
+                    table = dict(tables[shard])
+                    for name, grades, aggregate in items:
+                        record = table.get(name)
+                        if record is None:
+                            student_grades = []
+                        else:
+                            student_grades, count, _, previous = record
+                            aggregate.merge(previous)
+                            # drop anything past the published count, in case a
+                            # write was interrupted after appending
+                            del student_grades[count:]
+                        # readers of older records only look at their first
+                        # count grades, so appending in place is safe
+                        student_grades.extend(grades)
+                        table[name] = (student_grades, len(student_grades),
+                                       aggregate.stats(), aggregate)
+                    tables[shard] = table
+                    grow = grow or len(table) > 2 * self.SHARD_STUDENTS
+        if grow:
+            self._grow()
+    
+    def remove_student(self, name):
+        """Forget a student entirely; KeyError if absent."""
+        while True:
+            shards = locks, tables = self._shards
+            shard = hash(name) % len(tables)
+            with locks[shard]:
+                if self._shards is shards:
+                    table = dict(tables[shard])
+                    del table[name]
+                    tables[shard] = table
+                    return
+    
+    def grades_of(self, name):
+        """One student's grades as a tuple."""
+        grades, count = self._table_of(name)[name][:2]
+        return tuple(grades[:count])
+    
+    def student_stats(self, name):
+        """Stats of one student, without locking."""
+        return dict(self._table_of(name)[name][2])
+    
+    def stats(self):
+        """Stats of every student, same format as calculate_student_stats."""
+        return {name: dict(record[2])
+                for table in list(self._shards[1]) for name, record in table.items()}
+    
+    def top(self, n=3):
+        """The best n students as (name, average)."""
+        return heapq.nsmallest(max(n, 0), self._averages(), key=_rank_key)
+    
+    def above(self, threshold):
+        """Names with average >= threshold, alphabetically."""
+        return sorted(name for name, average in self._averages() if average >= threshold)
+    
+    def _table_of(self, name):
+        tables = self._shards[1]
+        return tables[hash(name) % len(tables)]
+    
+    def _grow(self):
+        """Double the shard count until shards average SHARD_STUDENTS students or fewer."""
+        with self._resize_lock:
+            locks, tables = self._shards
+            students = sum(len(table) for table in tables)
+            if students <= len(tables) * self.SHARD_STUDENTS:
+                return
+            for lock in locks:
+                lock.acquire()
+            try:
+                size = len(tables) * 2
+                while size * self.SHARD_STUDENTS < students:
+                    size *= 2
+                resized = [{} for _ in range(size)]
+                for table in tables:
+                    for name, record in table.items():
+                        resized[hash(name) % size][name] = record
+                self._shards = ([threading.Lock() for _ in range(size)], resized)
+            finally:
+                for lock in locks:
+                    lock.release()
+    
+    def _averages(self):
+        return [(name, record[2]['average'])
+                for table in list(self._shards[1]) for name, record in table.items()]
@@ -6,11 +6,27 @@ These tests will help you understand exactly what your functions should do.
 import unittest
 import sys
 import os
+import mmap
+import random
+import subprocess
+import tempfile
+from array import array
+from unittest import mock
 
 # Add parent directory to path to import the module
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import list_operations
 from list_operations import find_duplicates, remove_duplicates_preserve_order, find_common_elements
+from list_operations import find_duplicates_external, BloomFilter, iter_unique, RoaringBitmap
+from list_operations import DuplicateTracker, int64_view, find_frequent, CountMinSketch
+from list_operations import minhash_signature, estimate_jaccard, estimate_overlap, similar_pairs
+from list_operations import iter_common_elements, iter_union_elements, iter_difference_elements
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 class TestListOperations(unittest.TestCase):
@@ -91,6 +107,413 @@ class TestListOperations(unittest.TestCase):
         result = find_common_elements([1, 2, 3], [1, 2, 3])
         self.assertEqual(sorted(result), [1, 2, 3])
 
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_find_duplicates_numpy_array(self):
+        """Test the vectorized path with a NumPy array"""
+        rng = random.Random(1)
+        numbers = [rng.randrange(500) for _ in range(2000)]
+        result = find_duplicates(np.array(numbers, dtype=np.int64))
+        self.assertEqual(result, find_duplicates(numbers))
+        self.assertTrue(all(type(x) is int for x in result))
+        for options in ({'approximate': True}, {'use_bitmap': True}):
+            result = find_duplicates(np.array(numbers, dtype=np.int64), **options)
+            self.assertEqual(result, find_duplicates(numbers))
+            self.assertTrue(all(type(x) is int for x in result))
+    
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_find_duplicates_numpy_edge_cases(self):
+        """Test the vectorized path with tiny and duplicate-free arrays"""
+        self.assertEqual(find_duplicates(np.array([], dtype=np.int64)), [])
+        self.assertEqual(find_duplicates(np.array([7])), [])
+        self.assertEqual(find_duplicates(np.arange(100)), [])
+        self.assertEqual(find_duplicates(np.array([-3, 5, -3, 5, 5])), [-3, 5])
+    
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_find_common_elements_numpy_arrays(self):
+        """Test NumPy arrays as inputs, including an empty one"""
+        self.assertEqual(find_common_elements(np.array([1, 2, 3]), np.array([2, 3, 4])), [2, 3])
+        self.assertEqual(find_common_elements(np.array([3, 1, 3]), [3, 9], np.array([5, 3])), [3])
+        self.assertEqual(find_common_elements(np.array([], dtype=np.int64), np.array([1])), [])
+    
+    def test_find_duplicates_int64_array(self):
+        """Test array.array('q') input on both sides of the size cutoff"""
+        rng = random.Random(2)
+        numbers = [rng.randrange(-1000, 1000) for _ in range(list_operations.NUMPY_MIN_SIZE)]
+        expected = find_duplicates(numbers)
+        self.assertEqual(find_duplicates(array('q', numbers)), expected)
+        self.assertEqual(find_duplicates(array('q', numbers[:50])), find_duplicates(numbers[:50]))
+        self.assertEqual(find_duplicates(array('q')), [])
+
+    def test_find_duplicates_external_iterable(self):
+        """Test out-of-core duplicates match the in-memory result"""
+        rng = random.Random(3)
+        numbers = [rng.randrange(-5000, 5000) for _ in range(20000)]
+        result = find_duplicates_external(iter(numbers))
+        self.assertEqual(result, find_duplicates(numbers))
+        self.assertEqual(find_duplicates_external([]), [])
+    
+    def test_find_duplicates_external_small_budget(self):
+        """Test that oversized buckets are re-partitioned, including skewed input"""
+        rng = random.Random(4)
+        numbers = [rng.randrange(3000) for _ in range(5000)] + [42] * 5000
+        bucket_sizes = []
+        dedup_bucket = list_operations._find_duplicates_python
+        
+        def recording_dedup(values):
+            values = list(values)
+            bucket_sizes.append(len(set(values)))
+            return dedup_bucket(values)
+        
+        with mock.patch.object(list_operations, '_find_duplicates_python', recording_dedup):
+            result = find_duplicates_external(numbers, memory_limit=20000, num_buckets=4)
+        self.assertEqual(result, find_duplicates(numbers))
+        self.assertLessEqual(max(bucket_sizes), 20000 // list_operations._SET_BYTES_PER_ITEM)
+    
+    def test_find_duplicates_external_bounded_merge(self):
+        """Test result files are merged a few at a time, never all open at once"""
+        rng = random.Random(6)
+        numbers = [rng.randrange(20000) for _ in range(30000)]
+        open_readers = [0, 0]
+        read_spill = list_operations._read_spill
+        
+        def counting_read_spill(*args):
+            open_readers[0] += 1
+            open_readers[1] = max(open_readers)
+            try:
+                yield from read_spill(*args)
+            finally:
+                open_readers[0] -= 1
+        
+        with mock.patch.object(list_operations, 'MERGE_FAN_IN', 3), \
+                mock.patch.object(list_operations, '_read_spill', counting_read_spill):
+            result = find_duplicates_external(numbers, memory_limit=20000, num_buckets=8)
+        self.assertEqual(result, find_duplicates(numbers))
+        self.assertLessEqual(open_readers[1], 3)
+    
+    def test_find_duplicates_external_file(self):
+        """Test reading whitespace-separated integers from a file path"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'ids.txt')
+            with open(path, 'w') as handle:
+                handle.write("5 3 9\n3 1\n\n9 9 2\n")
+            self.assertEqual(find_duplicates_external(path), [3, 9])
+
+    def test_bloom_filter_no_false_negatives(self):
+        """Test that every added value is reported as present"""
+        bloom = BloomFilter(1000, 0.01)
+        for value in range(1000):
+            bloom.add(value)
+        self.assertTrue(all(value in bloom for value in range(1000)))
+        self.assertTrue(bloom.add(5))
+    
+    def test_bloom_filter_false_positive_rate(self):
+        """Test the measured false-positive rate stays near the target"""
+        bloom = BloomFilter(5000, 0.01)
+        for value in range(5000):
+            bloom.add(value)
+        probes = range(10 ** 9, 10 ** 9 + 20000)
+        measured = sum(value in bloom for value in probes) / len(probes)
+        self.assertLess(measured, 0.02)
+        self.assertLess(bloom.estimated_false_positive_rate(), 0.02)
+        self.assertRaises(ValueError, BloomFilter, 10, 1.5)
+    
+    def test_approximate_mode_matches_exact_without_collisions(self):
+        """Test approximate mode keeps all real duplicates and first occurrences"""
+        numbers = [1, 2, 3, 2, 4, 1, 5]
+        self.assertEqual(remove_duplicates_preserve_order(numbers, approximate=True,
+                                                          error_rate=1e-9), [1, 2, 3, 4, 5])
+        self.assertEqual(find_duplicates(numbers, approximate=True, error_rate=1e-9), [1, 2])
+        rng = random.Random(5)
+        numbers = [rng.randrange(10000) for _ in range(10000)]
+        approx = find_duplicates(numbers, approximate=True)
+        self.assertTrue(set(find_duplicates(numbers)) <= set(approx))
+        self.assertRaises(ValueError, find_duplicates, iter(numbers), approximate=True)
+    
+    def test_approximate_mode_hashes_integers_by_value(self):
+        """Test integers that share a hash() value are kept apart"""
+        self.assertEqual(find_duplicates([-1, -2], approximate=True, error_rate=1e-9), [])
+        numbers = [7, 7 + 2 ** 61 - 1, 3]
+        self.assertEqual(remove_duplicates_preserve_order(numbers, approximate=True,
+                                                          error_rate=1e-9), numbers)
+        self.assertEqual(find_duplicates([1, 1.0], approximate=True), [1])
+
+    def test_iter_unique_is_lazy(self):
+        """Test iter_unique yields first occurrences without reading ahead"""
+        def stream():
+            yield from [1, 2, 1, 3]
+            raise AssertionError("read too far")
+        result = iter_unique(stream())
+        self.assertEqual([next(result), next(result), next(result)], [1, 2, 3])
+        self.assertEqual(list(iter_unique([])), [])
+    
+    def test_iter_unique_window(self):
+        """Test the LRU window forgets the least recently seen value"""
+        self.assertEqual(list(iter_unique([1, 2, 3, 1], window=2)), [1, 2, 3, 1])
+        # 1 is refreshed by its repeat, so 2 is the value that gets forgotten
+        self.assertEqual(list(iter_unique([1, 2, 1, 3, 1, 2], window=2)), [1, 2, 3, 2])
+        self.assertEqual(list(iter_unique([5, 5, 5], window=1)), [5])
+        with self.assertRaises(ValueError):
+            list(iter_unique([1], window=0))
+
+    def test_find_common_elements_many_lists(self):
+        """Test intersecting more than two lists, sorted and unsorted"""
+        self.assertEqual(find_common_elements([1, 2, 3], [2, 3], [3, 2, 9]), [2, 3])
+        self.assertEqual(find_common_elements([5, 1, 3], [1, 3, 5], [3, 5, 1, 1], [7]), [])
+        rng = random.Random(6)
+        lists = [[rng.randrange(300) for _ in range(rng.randrange(50, 3000))]
+                 for _ in range(6)]
+        lists[1].sort()
+        lists[4].sort()
+        expected = sorted(set.intersection(*map(set, lists)))
+        self.assertEqual(find_common_elements(*lists), expected)
+        self.assertEqual(find_common_elements(*lists, sorted_inputs=False), expected)
+    
+    def test_find_common_elements_skewed_sorted(self):
+        """Test galloping search only touches a few elements of a huge sorted input"""
+        class CountingRange:
+            def __init__(self, n):
+                self.items = range(n)
+                self.reads = 0
+            def __len__(self):
+                return len(self.items)
+            def __getitem__(self, index):
+                self.reads += 1
+                return self.items[index]
+        large = CountingRange(10 ** 7)
+        small = [3, 17, 4000, 123456, 9999999, 10 ** 8]
+        result = find_common_elements(small, large, sorted_inputs=True)
+        self.assertEqual(result, [3, 17, 4000, 123456, 9999999])
+        self.assertLess(large.reads, 1000)
+        sorted_small = [2, 2, 4, 8, 9]
+        self.assertEqual(find_common_elements(sorted_small, list(range(0, 10, 2))), [2, 4, 8])
+
+    def test_roaring_bitmap_containers(self):
+        """Test sparse, dense and negative values round-trip in sorted order"""
+        dense = list(range(100000, 110000))
+        sparse = [3, -7, 2 ** 40, 65535, 65536]
+        bitmap = RoaringBitmap(dense + sparse + dense[:10])
+        self.assertEqual(len(bitmap), len(dense) + len(sparse))
+        self.assertEqual(list(bitmap), sorted(dense + sparse))
+        self.assertIn(-7, bitmap)
+        self.assertIn(105000, bitmap)
+        self.assertNotIn(4, bitmap)
+        self.assertNotIn(99999, bitmap)
+        self.assertFalse(bitmap.add(3))
+        self.assertLess(bitmap.memory_bytes(), 8 * len(dense))
+    
+    def test_roaring_bitmap_intersection(self):
+        """Test intersecting every combination of array and bitmap containers"""
+        rng = random.Random(7)
+        left = set(rng.sample(range(200000), 30000)) | set(range(300000, 300100))
+        right = set(rng.sample(range(200000), 30000)) | set(range(300050, 300500, 3))
+        common = RoaringBitmap(left) & RoaringBitmap(right)
+        self.assertEqual(list(common), sorted(left & right))
+        self.assertEqual(len(common), len(left & right))
+        dense = RoaringBitmap(range(70000)) & RoaringBitmap(range(1000, 80000))
+        self.assertEqual(list(dense), list(range(1000, 70000)))
+        self.assertEqual(list(RoaringBitmap([1, 2]).intersection(RoaringBitmap([2]), RoaringBitmap())), [])
+    
+    def test_use_bitmap_matches_default(self):
+        """Test use_bitmap gives the same answers as the set-based versions"""
+        rng = random.Random(8)
+        numbers = [rng.randrange(-50000, 50000) for _ in range(20000)]
+        other = [rng.randrange(-50000, 50000) for _ in range(5000)]
+        self.assertEqual(find_duplicates(numbers, use_bitmap=True), find_duplicates(numbers))
+        self.assertEqual(remove_duplicates_preserve_order(numbers, use_bitmap=True),
+                         remove_duplicates_preserve_order(numbers))
+        self.assertEqual(find_common_elements(numbers, other, [0, 1, 2] + other, use_bitmap=True),
+                         find_common_elements(numbers, other, [0, 1, 2] + other))
+        self.assertEqual(find_common_elements([], other, use_bitmap=True), [])
+
+    def test_workers_match_serial(self):
+        """Test the sharded multi-process path gives the serial answers"""
+        rng = random.Random(9)
+        numbers = [rng.randrange(-2 ** 40, 2 ** 40) for _ in range(3000)] * 2
+        numbers += [rng.randrange(1000) for _ in range(3000)]
+        other = [rng.randrange(1000) for _ in range(500)] + numbers[:100]
+        self.assertEqual(find_duplicates(numbers, workers=3), find_duplicates(numbers))
+        self.assertEqual(find_common_elements(numbers, other, [5, 7] + other, workers=2),
+                         find_common_elements(numbers, other, [5, 7] + other))
+        self.assertEqual(find_duplicates([1], workers=2), [])
+        self.assertEqual(find_duplicates(iter(numbers), workers=2), find_duplicates(numbers))
+        self.assertEqual(find_duplicates(iter([4]), workers=2), [])
+        self.assertEqual(find_common_elements([], [1, 2], workers=2), [])
+
+    def test_duplicate_tracker_updates(self):
+        """Test the tracker stays equal to find_duplicates through updates"""
+        tracker = DuplicateTracker([1, 2, 3, 2])
+        self.assertEqual(tracker.duplicates(), [2])
+        tracker.add(3)
+        tracker.extend([0, 0, 9])
+        self.assertEqual(tracker.duplicates(), [0, 2, 3])
+        tracker.remove(2)
+        self.assertEqual(tracker.duplicates(), [0, 3])
+        self.assertEqual(tracker.count(2), 1)
+        self.assertEqual(len(tracker), 7)
+        with self.assertRaises(ValueError):
+            tracker.remove(42)
+    
+    def test_duplicate_tracker_random_operations(self):
+        """Test random adds and removes against recomputing from scratch"""
+        rng = random.Random(10)
+        tracker = DuplicateTracker()
+        items = []
+        for _ in range(2000):
+            if items and rng.random() < 0.4:
+                value = items.pop(rng.randrange(len(items)))
+                tracker.remove(value)
+            else:
+                value = rng.randrange(50)
+                items.append(value)
+                tracker.add(value)
+            self.assertEqual(tracker.duplicates(), find_duplicates(items))
+
+    def test_int64_file_input(self):
+        """Test raw little-endian int64 files are read in place"""
+        numbers = [5, -3, 2 ** 62, 5, 9, -3, 0]
+        other = [-3, 0, 1, 2 ** 62]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'ids.bin')
+            other_path = os.path.join(tmp, 'other.bin')
+            empty_path = os.path.join(tmp, 'empty.bin')
+            with open(path, 'wb') as handle:
+                array('q', numbers).tofile(handle)
+            with open(other_path, 'wb') as handle:
+                array('q', other).tofile(handle)
+            open(empty_path, 'wb').close()
+            self.assertEqual(int64_view(path).tolist(), numbers)
+            self.assertEqual(find_duplicates(path), [-3, 5])
+            self.assertEqual(find_common_elements(path, other_path), [-3, 0, 2 ** 62])
+            self.assertEqual(find_duplicates(empty_path), [])
+            with open(path, 'rb') as handle:
+                mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+                self.assertEqual(find_duplicates(mapped), [-3, 5])
+    
+    def test_find_common_elements_sorted_files(self):
+        """Test sorted int64 files are joined without converting every value"""
+        evens = list(range(0, 20000, 2))
+        threes = list(range(-300, 20000, 3))
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [os.path.join(tmp, 'evens.bin'), os.path.join(tmp, 'threes.bin')]
+            for path, values in zip(paths, (evens, threes)):
+                with open(path, 'wb') as handle:
+                    array('q', values).tofile(handle)
+            common = find_common_elements(*paths)
+            self.assertEqual(common, find_common_elements(evens, threes))
+            self.assertTrue(all(type(value) is int for value in common))
+            self.assertEqual(find_common_elements(paths[0], paths[1], [6, 7, 12]), [6, 12])
+    
+    def test_memoryview_input(self):
+        """Test memoryviews of fixed-width integers are used directly"""
+        raw = array('q', [4, 1, 4, 1, 7]).tobytes()
+        view = memoryview(raw).cast('q')
+        self.assertEqual(find_duplicates(view), [1, 4])
+        self.assertEqual(find_common_elements(view, [7, 4, 8]), [4, 7])
+        self.assertEqual(int64_view(raw).tolist(), [4, 1, 4, 1, 7])
+
+    def test_find_frequent_basic(self):
+        """Test heavy hitters on small inputs"""
+        self.assertEqual(find_frequent([1, 1, 1, 2, 2, 3], 2), [(1, 2), (2, 1)])
+        self.assertEqual(find_frequent([4, 4, 5], 5), [(4, 2), (5, 1)])
+        self.assertEqual(find_frequent([], 3), [])
+        self.assertRaises(ValueError, find_frequent, [1], 0)
+    
+    def test_find_frequent_error_bound(self):
+        """Test the documented Misra-Gries bound c - n/(k+1) <= e <= c"""
+        rng = random.Random(11)
+        numbers = [int(rng.paretovariate(1.2)) for _ in range(20000)]
+        k = 20
+        true_counts = {}
+        for value in numbers:
+            true_counts[value] = true_counts.get(value, 0) + 1
+        estimates = dict(find_frequent(numbers, k))
+        slack = len(numbers) / (k + 1)
+        for value, count in true_counts.items():
+            estimate = estimates.get(value, 0)
+            self.assertLessEqual(estimate, count)
+            self.assertGreaterEqual(estimate, count - slack)
+    
+    def test_count_min_sketch_error_bound(self):
+        """Test Count-Min estimates never undercount and stay within epsilon * n"""
+        rng = random.Random(12)
+        numbers = [rng.randrange(2000) for _ in range(20000)]
+        sketch = CountMinSketch.from_error(epsilon=0.005, delta=0.01)
+        find_frequent(numbers, 10, sketch=sketch)
+        self.assertEqual(sketch.total, len(numbers))
+        true_counts = {}
+        for value in numbers:
+            true_counts[value] = true_counts.get(value, 0) + 1
+        over = 0
+        for value, count in true_counts.items():
+            estimate = sketch.estimate(value)
+            self.assertGreaterEqual(estimate, count)
+            over += estimate > count + 0.005 * len(numbers)
+        self.assertLessEqual(over, 0.01 * len(true_counts) + 1)
+        sketch = CountMinSketch(1000, 5)
+        sketch.add(-1)
+        self.assertEqual(sketch.estimate(-2), 0)
+        self.assertEqual(sketch.estimate(-1), 1)
+
+    def test_minhash_estimates(self):
+        """Test MinHash Jaccard and overlap estimates land near the exact values"""
+        first = list(range(0, 3000)) * 2
+        second = range(1500, 4500)
+        sig1 = minhash_signature(first, num_perm=256)
+        sig2 = minhash_signature(second, num_perm=256)
+        self.assertEqual(sig1.typecode, 'Q')
+        self.assertEqual(len(sig1), 256)
+        self.assertAlmostEqual(estimate_jaccard(sig1, sig2), 1 / 3, delta=0.1)
+        self.assertAlmostEqual(estimate_overlap(sig1, sig2), 1500, delta=500)
+        self.assertEqual(estimate_jaccard(sig1, minhash_signature(reversed(first), num_perm=256)), 1.0)
+        self.assertEqual(estimate_overlap(minhash_signature([]), minhash_signature([])), 0.0)
+    
+    def test_minhash_signatures_are_deterministic(self):
+        """Test hash() collisions are gone and str signatures survive a new process"""
+        self.assertLess(estimate_jaccard(minhash_signature([-1]), minhash_signature([-2])), 0.1)
+        words = ['alpha', 'beta', b'gamma', 3, 2.5]
+        code = ("import sys; sys.path.insert(0, %r); from list_operations import minhash_signature; "
+                "print(list(minhash_signature(%r, num_perm=16)))"
+                % (os.path.dirname(os.path.abspath(list_operations.__file__)), words))
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                env=dict(os.environ, PYTHONHASHSEED='123'), check=True).stdout
+        self.assertEqual(output.strip(), str(list(minhash_signature(words, num_perm=16))))
+    
+    def test_similar_pairs(self):
+        """Test screening finds the overlapping pair and skips disjoint lists"""
+        lists = [range(0, 1000), range(5000, 6000), range(100, 1100), range(9000, 9500)]
+        signatures = [minhash_signature(values) for values in lists]
+        pairs = similar_pairs(signatures, 0.5)
+        self.assertEqual([(i, j) for i, j, _ in pairs], [(0, 2)])
+        self.assertEqual(similar_pairs([], 0.5), [])
+
+    def test_merge_join_variants(self):
+        """Test streamed intersection, union and difference of sorted inputs"""
+        left = [1, 2, 2, 5, 8, 8, 9]
+        right = [2, 3, 5, 5, 10]
+        self.assertEqual(list(iter_common_elements(iter(left), iter(right))), [2, 5])
+        self.assertEqual(list(iter_union_elements(left, right)), [1, 2, 3, 5, 8, 9, 10])
+        self.assertEqual(list(iter_difference_elements(left, right)), [1, 8, 9])
+        self.assertEqual(list(iter_difference_elements(right, left)), [3, 10])
+        self.assertEqual(list(iter_common_elements([], right)), [])
+        self.assertEqual(list(iter_union_elements([], [])), [])
+        rng = random.Random(13)
+        a = sorted(rng.randrange(500) for _ in range(400))
+        b = sorted(rng.randrange(500) for _ in range(300))
+        self.assertEqual(list(iter_common_elements(a, b)), find_common_elements(a, b))
+    
+    def test_merge_join_files_and_unsorted_input(self):
+        """Test merge join reads sorted text files and rejects unsorted input"""
+        with tempfile.TemporaryDirectory() as tmp:
+            first = os.path.join(tmp, 'a.txt')
+            second = os.path.join(tmp, 'b.txt')
+            with open(first, 'w') as handle:
+                handle.write("1\n4\n4\n7\n")
+            with open(second, 'w') as handle:
+                handle.write("4 5 7 7\n")
+            self.assertEqual(list(iter_common_elements(first, second)), [4, 7])
+        with self.assertRaises(ValueError):
+            list(iter_union_elements([3, 1], [2]))
+
 
 if __name__ == '__main__':
     unittest.main()
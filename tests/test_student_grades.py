@@ -6,11 +6,23 @@ These tests will help you understand exactly what your functions should do.
 import unittest
 import sys
 import os
+import json
+import random
+import statistics
+from bisect import bisect_left
+import tempfile
+import threading
+from unittest import mock
 
 # Add parent directory to path to import the module
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import student_grades
 from student_grades import calculate_student_stats, get_top_students, students_above_threshold
+from student_grades import GradeBook, StudentAggregate, RunningGradeStats, Leaderboard
+from student_grades import ThresholdIndex, load_grade_aggregates, TDigest, cohort_digest
+from student_grades import save_snapshot, GradeSnapshot, GradeStore, StatsCache
+from student_grades import ConcurrentGradeBook, RankIndex
 
 
 class TestStudentGrades(unittest.TestCase):
@@ -133,6 +145,549 @@ class TestStudentGrades(unittest.TestCase):
         result = students_above_threshold({}, 85)
         self.assertEqual(result, [])
 
+    def test_gradebook_matches_dict(self):
+        """Test columnar stats equal the dictionary stats, int-ness included"""
+        grades = dict(self.grades, Empty=[], Frank=[70])
+        book = GradeBook.from_dict(grades)
+        self.assertEqual(book.names, list(grades))
+        self.assertEqual(list(book.offsets), [0, 4, 7, 12, 15, 15, 16])
+        result = calculate_student_stats(book)
+        self.assertEqual(result, calculate_student_stats(grades))
+        self.assertIs(type(result['Alice']['highest']), int)
+        self.assertEqual(result['Empty'], {'average': 0.0, 'highest': None,
+                                           'lowest': None, 'total_assignments': 0})
+        self.assertEqual(book.to_dict(), grades)
+        self.assertEqual(get_top_students(book, 2), get_top_students(self.grades, 2))
+        self.assertEqual(students_above_threshold(book, 90), ['Charlie', 'Diana'])
+    
+    def test_gradebook_float_grades_without_numpy(self):
+        """Test float grades and the pure-Python reduction path"""
+        grades = {'A': [88.5, 91.25], 'B': [], 'C': [60.0]}
+        book = GradeBook.from_dict(grades)
+        expected = calculate_student_stats(grades)
+        self.assertEqual(calculate_student_stats(book), expected)
+        saved = student_grades.np
+        student_grades.np = None
+        try:
+            self.assertEqual(calculate_student_stats(book), expected)
+        finally:
+            student_grades.np = saved
+        self.assertEqual(calculate_student_stats(GradeBook.from_dict({})), {})
+    
+    @unittest.skipIf(student_grades.np is None, "NumPy not installed")
+    def test_gradebook_fsum_only_where_sums_can_round(self):
+        """Test half and quarter grades keep the vectorized sums"""
+        grades = {'halves': [87.5, 92.25, 70.75], 'thirds': [0.1, 0.2, 0.3],
+                  'whole': [90.0, 81.0], 'huge': [2.0 ** 60, 1.0], 'none': []}
+        book = GradeBook.from_dict(grades)
+        with mock.patch.object(student_grades.math, 'fsum', wraps=student_grades.math.fsum) as fsum:
+            stats = calculate_student_stats(book)
+        self.assertEqual(fsum.call_count, 2)
+        self.assertEqual(stats, calculate_student_stats(grades))
+    
+    def test_gradebook_float_sums_match_dict(self):
+        """Test float totals round like the dictionary path on both reductions"""
+        rng = random.Random(19)
+        grades = {'a': [63.712, 75.847, 1.486]}
+        for i in range(3000):
+            grades['s%d' % i] = [round(rng.uniform(0, 100), 3) for _ in range(rng.randint(1, 6))]
+        expected = calculate_student_stats(grades)
+        self.assertEqual(expected['a']['average'], 47.01)
+        book = GradeBook.from_dict(grades)
+        self.assertEqual(calculate_student_stats(book), expected)
+        saved = student_grades.np
+        student_grades.np = None
+        try:
+            self.assertEqual(calculate_student_stats(book), expected)
+        finally:
+            student_grades.np = saved
+
+    def test_student_aggregate_welford(self):
+        """Test running aggregates against recomputed stats and variance"""
+        rng = random.Random(1)
+        grades = [rng.uniform(40, 100) for _ in range(500)]
+        aggregate = StudentAggregate()
+        for grade in grades:
+            aggregate.add(grade)
+        self.assertEqual(aggregate.stats(), calculate_student_stats({'S': grades})['S'])
+        self.assertAlmostEqual(aggregate.variance, statistics.pvariance(grades), places=6)
+        self.assertEqual(StudentAggregate().variance, 0.0)
+    
+    def test_running_grade_stats_updates(self):
+        """Test incremental adds, removals and corrections"""
+        running = RunningGradeStats(self.grades)
+        self.assertEqual(calculate_student_stats(running), calculate_student_stats(self.grades))
+        running.add_grade('Bob', 100)
+        running.add_grade('Eve', 50)
+        self.assertEqual(running.student_stats('Bob')['average'], 89.0)
+        self.assertEqual(running.student_stats('Eve')['total_assignments'], 1)
+        running.remove_grade('Alice', 78)
+        self.assertEqual(running.student_stats('Alice')['lowest'], 85)
+        running.correct_grade('Diana', 100, 90)
+        self.assertEqual(running.student_stats('Diana')['highest'], 99)
+        running.remove_student('Eve')
+        expected = dict(self.grades, Bob=[76, 88, 92, 100], Alice=[85, 92, 96],
+                        Diana=[90, 98, 99])
+        self.assertEqual(running.stats(), calculate_student_stats(expected))
+        self.assertEqual(get_top_students(running, 1), [('Diana', 95.67)])
+    
+    def test_running_grade_stats_without_grades(self):
+        """Test aggregate-only mode refuses corrections"""
+        running = RunningGradeStats(self.grades, keep_grades=False)
+        self.assertIsNone(running.grades)
+        self.assertEqual(running.stats(), calculate_student_stats(self.grades))
+        with self.assertRaises(ValueError):
+            running.remove_grade('Alice', 85)
+        aggregates = {name: StudentAggregate(grades) for name, grades in self.grades.items()}
+        self.assertEqual(calculate_student_stats(aggregates), calculate_student_stats(self.grades))
+
+    def test_get_top_students_ties_and_zero(self):
+        """Test equal averages are ordered by name and n <= 0 gives nothing"""
+        grades = {'Zed': [90], 'Amy': [90], 'Kim': [95], 'Bo': [90]}
+        self.assertEqual(get_top_students(grades, 3), [('Kim', 95.0), ('Amy', 90.0), ('Bo', 90.0)])
+        self.assertEqual(get_top_students(grades, 0), [])
+    
+    def test_leaderboard_tracks_changes(self):
+        """Test the maintained leaderboard matches recomputing from scratch"""
+        board = Leaderboard.from_grades(self.grades)
+        self.assertEqual(get_top_students(board, 3), get_top_students(self.grades, 3))
+        rng = random.Random(2)
+        grades = {name: list(values) for name, values in self.grades.items()}
+        running = RunningGradeStats(grades)
+        for step in range(200):
+            name = rng.choice(['Alice', 'Bob', 'Charlie', 'Diana', 'Eve', 'Finn'])
+            running.add_grade(name, rng.randrange(60, 101))
+            board.update(name, running.student_stats(name)['average'])
+            self.assertEqual(board.top(4), get_top_students(running, 4))
+        board.remove('Finn')
+        self.assertNotIn('Finn', board)
+        self.assertEqual(len(board), 5)
+        self.assertEqual(board.top(0), [])
+
+    def test_threshold_index_queries(self):
+        """Test indexed threshold and range queries match full scans"""
+        index = ThresholdIndex(self.grades)
+        for threshold in [0, 80, 87.75, 90, 95, 99, 99.01, 100]:
+            self.assertEqual(students_above_threshold(index, threshold),
+                             students_above_threshold(self.grades, threshold))
+        self.assertEqual(index.between(85, 90), ['Alice', 'Bob'])
+        self.assertEqual(index.between(90, 85), [])
+        self.assertEqual(index.count_above(90), 2)
+        self.assertEqual(ThresholdIndex({}).above(50), [])
+    
+    def test_threshold_index_large_and_batch(self):
+        """Test both result-ordering strategies and the batch sweep"""
+        rng = random.Random(3)
+        grades = {'S%04d' % i: [rng.randrange(40, 101) for _ in range(3)] for i in range(2000)}
+        index = ThresholdIndex(grades)
+        thresholds = [95, 50, 99.5, 70, 70, 101]
+        expected = [students_above_threshold(grades, t) for t in thresholds]
+        self.assertEqual([index.above(t) for t in thresholds], expected)
+        self.assertEqual(index.batch_above(thresholds), expected)
+        averages = {name: stats['average'] for name, stats in calculate_student_stats(grades).items()}
+        self.assertEqual(index.between(60, 61.5),
+                         sorted(name for name, average in averages.items() if 60 <= average <= 61.5))
+
+    def test_load_grade_aggregates_csv(self):
+        """Test streaming a CSV export in small chunks"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'grades.csv')
+            with open(path, 'w') as handle:
+                handle.write("id,name,grade\n")
+                row = 0
+                for name, grades in self.grades.items():
+                    for grade in grades:
+                        handle.write("%d,%s,%s\n" % (row, name, grade))
+                        row += 1
+            running = load_grade_aggregates(path, chunk_size=4)
+            self.assertIsNone(running.grades)
+            self.assertEqual(calculate_student_stats(running), calculate_student_stats(self.grades))
+            self.assertEqual(get_top_students(running, 2), get_top_students(self.grades, 2))
+            self.assertEqual(students_above_threshold(running, 90), ['Charlie', 'Diana'])
+            with self.assertRaises(ValueError):
+                load_grade_aggregates(path, grade_field='score')
+    
+    def test_load_grade_aggregates_jsonl(self):
+        """Test JSONL rows with single grades and grade lists, added to existing stats"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'grades.data')
+            with open(path, 'w') as handle:
+                handle.write(json.dumps({'name': 'Alice', 'grades': [85, 92, 78]}) + "\n\n")
+                handle.write(json.dumps({'name': 'Bob', 'grade': 76.5}) + "\n")
+                handle.write(json.dumps({'name': 'Alice', 'grade': 96}) + "\n")
+            running = load_grade_aggregates(path, file_format='jsonl')
+            self.assertEqual(running.stats(), calculate_student_stats(
+                {'Alice': [85, 92, 78, 96], 'Bob': [76.5]}))
+            load_grade_aggregates(path, file_format='jsonl', running=running)
+            self.assertEqual(running.student_stats('Bob')['total_assignments'], 2)
+            with self.assertRaises(ValueError):
+                load_grade_aggregates(path)
+
+    def test_student_aggregate_merge(self):
+        """Test merged partial aggregates equal one aggregate over all grades"""
+        rng = random.Random(4)
+        grades = [rng.uniform(0, 100) for _ in range(300)] + [rng.randrange(100) for _ in range(50)]
+        merged = StudentAggregate(grades[:100]).merge(StudentAggregate()).merge(
+            StudentAggregate(grades[100:]))
+        whole = StudentAggregate(grades)
+        self.assertEqual(merged.stats(), whole.stats())
+        self.assertEqual(merged.stats(), calculate_student_stats({'S': grades})['S'])
+        self.assertAlmostEqual(merged.variance, whole.variance, places=6)
+        self.assertEqual(StudentAggregate().merge(whole).stats(), whole.stats())
+    
+    def test_calculate_student_stats_workers(self):
+        """Test the process pool path matches the serial path exactly"""
+        rng = random.Random(5)
+        grades = {'S%03d' % i: [rng.uniform(0, 100) for _ in range(rng.randrange(0, 20))]
+                  for i in range(200)}
+        grades['Ints'] = [90, 85, 77]
+        self.assertEqual(calculate_student_stats(grades, workers=3),
+                         calculate_student_stats(grades))
+        self.assertEqual(calculate_student_stats({}, workers=3), {})
+    
+    def test_load_grade_aggregates_workers(self):
+        """Test byte-range parallel loading matches the serial load"""
+        rng = random.Random(6)
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, 'grades.csv')
+            jsonl_path = os.path.join(tmp, 'grades.jsonl')
+            with open(csv_path, 'w') as csv_file, open(jsonl_path, 'w') as jsonl_file:
+                csv_file.write("name,grade\n")
+                for _ in range(3000):
+                    name = 'S%02d' % rng.randrange(60)
+                    grade = round(rng.uniform(0, 100), rng.randrange(4))
+                    csv_file.write("%s,%s\n" % (name, grade))
+                    jsonl_file.write(json.dumps({'name': name, 'grade': grade}) + "\n")
+            for path in (csv_path, jsonl_path):
+                serial = load_grade_aggregates(path).stats()
+                for workers in (2, 7):
+                    self.assertEqual(load_grade_aggregates(path, workers=workers).stats(), serial)
+            with self.assertRaises(ValueError):
+                load_grade_aggregates(csv_path, running=RunningGradeStats())
+
+    def test_tdigest_small_inputs_are_exact(self):
+        """Test quantiles equal statistics.median while every value is a centroid"""
+        for grades in ([85], [85, 92], [85, 92, 78, 96], list(range(50))):
+            aggregate = StudentAggregate(grades, compression=100)
+            self.assertEqual(aggregate.median(), statistics.median(grades))
+            self.assertEqual(aggregate.quantile(0), min(grades))
+            self.assertEqual(aggregate.quantile(1), max(grades))
+        self.assertIsNone(TDigest().quantile(0.5))
+        with self.assertRaises(ValueError):
+            StudentAggregate([1]).quantile(0.5)
+    
+    def test_student_aggregate_merge_needs_matching_compression(self):
+        """Test merging keeps digest counts in step and rejects mismatched digests"""
+        merged = StudentAggregate([70, 80], compression=100)
+        merged.merge(StudentAggregate([90], compression=100))
+        self.assertEqual(len(merged.digest), merged.count)
+        self.assertEqual(merged.digest._buffer_means.typecode, 'd')
+        for first, second in ((None, 100), (100, None), (100, 50)):
+            with self.assertRaises(ValueError):
+                StudentAggregate([1], compression=first).merge(
+                    StudentAggregate([2], compression=second))
+        # an empty aggregate has nothing to fold in, whatever its compression
+        StudentAggregate([1], compression=100).merge(StudentAggregate())
+    
+    def test_tdigest_rank_error_and_merge(self):
+        """Test quantile rank error stays near 1/compression, merged or not"""
+        rng = random.Random(7)
+        grades = [rng.gauss(70, 12) for _ in range(20000)]
+        ordered = sorted(grades)
+        whole = TDigest(100)
+        parts = [TDigest(100) for _ in range(5)]
+        for i, grade in enumerate(grades):
+            whole.add(grade)
+            parts[i % 5].add(grade)
+        merged = parts[0]
+        for part in parts[1:]:
+            merged.merge(part)
+        self.assertEqual(len(merged), len(grades))
+        for digest in (whole, merged):
+            for q in (0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99):
+                rank = bisect_left(ordered, digest.quantile(q)) / len(ordered)
+                self.assertLess(abs(rank - q), 0.02)
+    
+    def test_quantiles_through_loading_and_cohorts(self):
+        """Test per-student digests survive parallel loading and merge into cohorts"""
+        rng = random.Random(8)
+        grades = {'S%d' % i: [rng.randrange(40, 101) for _ in range(300)] for i in range(6)}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'grades.csv')
+            with open(path, 'w') as handle:
+                handle.write("name,grade\n")
+                for name, values in grades.items():
+                    for grade in values:
+                        handle.write("%s,%d\n" % (name, grade))
+            running = load_grade_aggregates(path, workers=3, compression=200)
+        for name, values in grades.items():
+            self.assertEqual(running.student_quantile(name, 0.5), statistics.median(values))
+        cohort = cohort_digest(running, ['S0', 'S1', 'S2'])
+        combined = sorted(grades['S0'] + grades['S1'] + grades['S2'])
+        self.assertEqual(len(cohort), len(combined))
+        rank = bisect_left(combined, cohort.quantile(0.9)) / len(combined)
+        self.assertLess(abs(rank - 0.9), 0.02)
+        with self.assertRaises(ValueError):
+            cohort_digest(RunningGradeStats(self.grades))
+
+    def test_snapshot_round_trip(self):
+        """Test a memory-mapped snapshot answers like the grades dictionary"""
+        grades = dict(self.grades, Empty=[], Zoë=[91.0])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'grades.snap')
+            save_snapshot(grades, path)
+            with GradeSnapshot(path) as snapshot:
+                self.assertEqual(len(snapshot), 6)
+                self.assertEqual(calculate_student_stats(snapshot), calculate_student_stats(grades))
+                self.assertEqual(get_top_students(snapshot, 3), get_top_students(grades, 3))
+                for threshold in (0, 90, 91, 99.5):
+                    self.assertEqual(students_above_threshold(snapshot, threshold),
+                                     students_above_threshold(grades, threshold))
+                self.assertEqual(snapshot.student_stats('Zoë')['highest'], 91.0)
+                grades_view = snapshot.grades_of('Bob')
+                self.assertEqual(grades_view.tolist(), [76.0, 88.0, 92.0])
+                grades_view.release()
+                with self.assertRaises(KeyError):
+                    snapshot.index_of('Nobody')
+    
+    def test_snapshot_float_averages_match_dict(self):
+        """Test stored averages and ranking use the dictionary path's exact sums"""
+        rng = random.Random(21)
+        grades = {'a': [63.712, 75.847, 1.486]}
+        for i in range(500):
+            grades['s%d' % i] = [round(rng.uniform(0, 100), 3) for _ in range(rng.randint(1, 6))]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'floats.snap')
+            save_snapshot(grades, path)
+            with GradeSnapshot(path) as snapshot:
+                self.assertEqual(snapshot.student_stats('a')['average'], 47.01)
+                self.assertEqual(calculate_student_stats(snapshot), calculate_student_stats(grades))
+                self.assertEqual(get_top_students(snapshot, 501), get_top_students(grades, 501))
+                self.assertEqual(students_above_threshold(snapshot, 47.01),
+                                 students_above_threshold(grades, 47.01))
+    
+    def test_snapshot_formats_and_errors(self):
+        """Test integral flags, empty snapshots and rejecting other files"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'ints.snap')
+            save_snapshot(RunningGradeStats(self.grades), path)
+            with GradeSnapshot(path) as snapshot:
+                self.assertIs(type(snapshot.student_stats('Alice')['highest']), int)
+            save_snapshot({}, path)
+            with GradeSnapshot(path) as snapshot:
+                self.assertEqual(snapshot.stats(), {})
+                self.assertEqual(snapshot.top(3), [])
+            other = os.path.join(tmp, 'other.bin')
+            with open(other, 'wb') as handle:
+                handle.write(b'\0' * 200)
+            with self.assertRaises(ValueError):
+                GradeSnapshot(other)
+
+    def test_grade_store_queries(self):
+        """Test the SQLite store answers like the grades dictionary"""
+        grades = dict(self.grades, Empty=[], Frank=[90.5, 80.25])
+        with GradeStore.from_grades(grades) as store:
+            self.assertEqual(len(store), 6)
+            self.assertEqual(calculate_student_stats(store), calculate_student_stats(grades))
+            self.assertEqual(get_top_students(store, 3), get_top_students(grades, 3))
+            for threshold in (0, 85.33, 90, 100):
+                self.assertEqual(students_above_threshold(store, threshold),
+                                 students_above_threshold(grades, threshold))
+            store.add_grade('Empty', 100)
+            store.add_grades('Bob', [100, 100])
+            grades['Empty'] = [100]
+            grades['Bob'] = grades['Bob'] + [100, 100]
+            self.assertEqual(store.stats(), calculate_student_stats(grades))
+            self.assertEqual(store.grades_of('Bob'), grades['Bob'])
+            store.remove_student('Diana')
+            self.assertNotIn('Diana', store)
+            with self.assertRaises(KeyError):
+                store.student_stats('Diana')
+    
+    def test_grade_store_float_grades_one_by_one(self):
+        """Test single float inserts keep averages equal to the dictionary path"""
+        rng = random.Random(0)
+        grades = {}
+        with GradeStore() as store:
+            for _ in range(3000):
+                name = 's%d' % rng.randrange(100)
+                grade = round(rng.uniform(0, 100), 2)
+                store.add_grade(name, grade)
+                grades.setdefault(name, []).append(grade)
+            self.assertEqual(store.stats(), calculate_student_stats(grades))
+            self.assertEqual(store.top(100), get_top_students(grades, 100))
+            # one student fed int and float grades singly and in batches
+            mixed = [rng.choice([rng.randint(0, 100), round(rng.uniform(0, 100), 3)])
+                     for _ in range(2000)]
+            for grade in mixed[:1000]:
+                store.add_grade('Mixed', grade)
+            store.add_rows((('Mixed', grade) for grade in mixed[1000:]), batch_size=7)
+            self.assertEqual(store.student_stats('Mixed'),
+                             calculate_student_stats({'Mixed': mixed})['Mixed'])
+    
+    def test_grade_store_persists_batches(self):
+        """Test batched file loading survives reopening the database"""
+        rng = random.Random(5)
+        rows = [('s%d' % rng.randrange(50), rng.randint(0, 100)) for _ in range(2000)]
+        grades = {}
+        for name, grade in rows:
+            grades.setdefault(name, []).append(grade)
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, 'grades.csv')
+            with open(csv_path, 'w') as handle:
+                handle.write('name,grade\n')
+                handle.writelines('%s,%d\n' % row for row in rows)
+            db_path = os.path.join(tmp, 'grades.db')
+            with GradeStore(db_path) as store:
+                store.load_file(csv_path, batch_size=300)
+            with GradeStore(db_path) as store:
+                self.assertEqual(store.stats(), calculate_student_stats(grades))
+                self.assertEqual(store.top(5), get_top_students(grades, 5))
+
+    def test_stats_cache_targeted_invalidation(self):
+        """Test a change recomputes only that student and the rankings"""
+        cache = StatsCache(self.grades)
+        self.assertEqual(calculate_student_stats(cache), calculate_student_stats(self.grades))
+        self.assertEqual(cache.cache_info()['misses'], 4)
+        self.assertEqual(get_top_students(cache, 2), get_top_students(self.grades, 2))
+        self.assertEqual(cache.cache_info(), {'hits': 4, 'misses': 5, 'students': 4, 'rankings': 1})
+        get_top_students(cache, 2)
+        self.assertEqual(cache.hits, 5)
+        
+        version = cache.version
+        cache.add_grade('Bob', 100)
+        self.assertEqual((cache.version, cache.version_of('Bob')), (version + 1, 2))
+        self.assertEqual(cache.cache_info()['students'], 3)
+        grades = dict(self.grades, Bob=self.grades['Bob'] + [100])
+        misses = cache.misses
+        self.assertEqual(students_above_threshold(cache, 88), students_above_threshold(grades, 88))
+        # the threshold query plus Bob's stats; the other students are hits
+        self.assertEqual(cache.misses, misses + 2)
+        self.assertEqual(get_top_students(cache, 2), get_top_students(grades, 2))
+        
+        cache.remove_student('Diana')
+        self.assertNotIn('Diana', cache)
+        self.assertEqual(cache.stats(), calculate_student_stats(
+            {name: grades[name] for name in grades if name != 'Diana'}))
+
+    def test_concurrent_grade_book_stress(self):
+        """Test readers always see consistent students while writers stream grades"""
+        book = ConcurrentGradeBook({'s%d' % i: [50] for i in range(40)}, shards=4)
+        stop = threading.Event()
+        errors = []
+        
+        def write(seed):
+            rng = random.Random(seed)
+            for _ in range(2000):
+                book.add_grade('s%d' % rng.randrange(40), 100)
+        
+        def read():
+            while not stop.is_set():
+                for name, stats in calculate_student_stats(book).items():
+                    grades = book.grades_of(name)
+                    if len(grades) < stats['total_assignments'] or stats['lowest'] != 50:
+                        errors.append((name, stats))
+                get_top_students(book, 5)
+        
+        readers = [threading.Thread(target=read) for _ in range(3)]
+        writers = [threading.Thread(target=write, args=(seed,)) for seed in range(3)]
+        for thread in readers + writers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        stop.set()
+        for thread in readers:
+            thread.join()
+        
+        self.assertEqual(errors, [])
+        stats = calculate_student_stats(book)
+        self.assertEqual(sum(s['total_assignments'] for s in stats.values()), 40 + 6000)
+        expected = {name: list(book.grades_of(name)) for name in stats}
+        self.assertEqual(stats, calculate_student_stats(expected))
+        self.assertEqual(students_above_threshold(book, 0), sorted(expected))
+        book.remove_student('s0')
+        self.assertNotIn('s0', book)
+        self.assertEqual(len(book), 39)
+        
+        large = ConcurrentGradeBook({'s%d' % i: [70.5] for i in range(10000)})
+        self.assertGreaterEqual(len(large._shards[1]) * ConcurrentGradeBook.SHARD_STUDENTS, 10000)
+        
+        # a book that starts empty grows its shards as students stream in
+        streamed = ConcurrentGradeBook()
+        writers = [threading.Thread(target=lambda offset=offset: [
+            streamed.add_grade('n%d' % i, 1) for i in range(offset, 20000, 4)])
+            for offset in range(4)]
+        for thread in writers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        self.assertEqual(len(streamed), 20000)
+        self.assertGreaterEqual(len(streamed._shards[1]) * 2 * ConcurrentGradeBook.SHARD_STUDENTS,
+                                20000)
+        self.assertEqual(streamed.student_stats('n12345')['total_assignments'], 1)
+        with self.assertRaises(ValueError):
+            large.add_grades('s1', [80, 'x'])
+        with self.assertRaises(ValueError):
+            large.update({'s2': [60], 's3': ['y']})
+        self.assertEqual(large.grades_of('s2'), (70.5,))
+        large.add_grades('s1', [80, 90.25])
+        self.assertEqual(large.student_stats('s1'), calculate_student_stats({'s1': [70.5, 80, 90.25]})['s1'])
+        self.assertEqual(large.grades_of('s1'), (70.5, 80, 90.25))
+
+    def test_rank_index_ties(self):
+        """Test competition, dense and ordinal ranks with ties"""
+        ranks = RankIndex({'Alice': 90.0, 'Bob': 95.0, 'Carol': 90.0, 'Dan': 80.0, 'Eve': 80.0})
+        self.assertEqual([ranks.rank_of(name) for name in 'Alice Bob Carol Dan Eve'.split()],
+                         [2, 1, 2, 4, 4])
+        self.assertEqual(ranks.rank_of('Eve', 'dense'), 3)
+        self.assertEqual(ranks.rank_of('Eve', 'ordinal'), 5)
+        self.assertEqual(ranks.ranked(2, 3), [('Alice', 90.0, 2), ('Carol', 90.0, 2)])
+        self.assertEqual(ranks.ranked(3, 3, 'dense'), [('Dan', 80.0, 3), ('Eve', 80.0, 3)])
+        self.assertEqual(ranks.ranked(3, 4, 'ordinal'), [('Carol', 90.0, 3), ('Dan', 80.0, 4)])
+        self.assertEqual(get_top_students(RankIndex.from_grades(self.grades), 2),
+                         get_top_students(self.grades, 2))
+        with self.assertRaises(ValueError):
+            ranks.rank_of('Alice', 'fractional')
+        self.assertIsInstance(ranks, Leaderboard)
+        ranks.update('Eve', 96.0)
+        self.assertEqual(ranks.top(2), [('Eve', 96.0), ('Bob', 95.0)])
+        self.assertEqual(ranks.rank_of('Dan', 'ordinal'), 5)
+    
+    def test_rank_index_incremental_updates(self):
+        """Test incremental updates match an index built from scratch"""
+        rng = random.Random(11)
+        averages = {'s%d' % i: float(rng.randint(60, 70)) for i in range(200)}
+        ranks = RankIndex(averages)
+        for _ in range(50):
+            changes = {'s%d' % rng.randrange(220): float(rng.randint(55, 75))
+                       for _ in range(rng.randint(1, 3))}
+            ranks.update(changes)
+            averages.update(changes)
+            if rng.random() < 0.2:
+                name = rng.choice(sorted(averages))
+                ranks.remove(name)
+                del averages[name]
+        fresh = RankIndex(averages)
+        for method in RankIndex.METHODS:
+            self.assertEqual({name: ranks.rank_of(name, method) for name in averages},
+                             {name: fresh.rank_of(name, method) for name in averages})
+            self.assertEqual(ranks.ranked(5, 40, method), fresh.ranked(5, 40, method))
+
+    def test_every_index_answers_top_and_threshold_queries(self):
+        """Test rankings and thresholds agree across all indexes and containers"""
+        grades = dict(self.grades, Eve=[91], Frank=[])
+        indexes = [Leaderboard.from_grades(grades), RankIndex.from_grades(grades),
+                   ThresholdIndex(grades), GradeStore.from_grades(grades),
+                   StatsCache(grades), ConcurrentGradeBook(grades), GradeBook.from_dict(grades),
+                   RunningGradeStats(grades)]
+        for index in indexes:
+            for n in (0, 1, 2, 3, 10):
+                self.assertEqual(get_top_students(index, n), get_top_students(grades, n))
+            for threshold in (0, 87.75, 91, 100):
+                self.assertEqual(students_above_threshold(index, threshold),
+                                 students_above_threshold(grades, threshold))
+        indexes[3].close()
+
 
 if __name__ == '__main__':
     unittest.main()